@@ -0,0 +1,30 @@
+"""pipeline_jobs: Audiospuren statt einzelner Audiodatei
+
+Revision ID: 2b9c7e3f5a04
+Revises: f4a0d2c87b19
+Create Date: 2026-10-18 17:20:44.618395
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b9c7e3f5a04'
+down_revision: Union[str, Sequence[str], None] = 'f4a0d2c87b19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('pipeline_jobs', sa.Column('tracks', sa.JSON(), nullable=True))
+    op.drop_column('pipeline_jobs', 'audio_path')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('pipeline_jobs', sa.Column('audio_path', sa.String(length=500), nullable=True))
+    op.drop_column('pipeline_jobs', 'tracks')
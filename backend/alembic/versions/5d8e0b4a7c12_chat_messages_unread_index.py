@@ -0,0 +1,33 @@
+"""Index für ungelesene Nachrichten pro Empfänger
+
+Revision ID: 5d8e0b4a7c12
+Revises: a3c91f5e2b7d
+Create Date: 2026-10-18 10:03:17.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8e0b4a7c12'
+down_revision: Union[str, Sequence[str], None] = 'a3c91f5e2b7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_chat_messages_unread',
+        'chat_messages',
+        ['receiver_id', 'sender_id', 'timestamp'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_chat_messages_unread', table_name='chat_messages')
@@ -0,0 +1,46 @@
+"""Partieller Index für aktive Meeting-Teilnahmen
+
+Revision ID: 8a3f6c1d9e27
+Revises: 2b9c7e3f5a04
+Create Date: 2026-10-18 18:05:12.337104
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a3f6c1d9e27'
+down_revision: Union[str, Sequence[str], None] = '2b9c7e3f5a04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Doppelte aktive Teilnahmen (bisher ohne Constraint möglich) schließen, nur die neueste bleibt offen
+    op.execute("""
+        UPDATE meeting_participants SET left_at = joined_at
+        WHERE left_at IS NULL AND id NOT IN (
+            SELECT max_id FROM (
+                SELECT max(id) AS max_id FROM meeting_participants
+                WHERE left_at IS NULL
+                GROUP BY meeting_id, user_id
+            ) AS newest
+        )
+    """)
+    op.create_index(
+        'ix_meeting_participants_active',
+        'meeting_participants',
+        ['meeting_id', 'user_id'],
+        unique=True,
+        postgresql_where=sa.text('left_at IS NULL'),
+        sqlite_where=sa.text('left_at IS NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_meeting_participants_active', table_name='meeting_participants')
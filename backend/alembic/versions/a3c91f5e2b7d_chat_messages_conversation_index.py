@@ -0,0 +1,33 @@
+"""Zusammengesetzter Index für die Chat-Historie
+
+Revision ID: a3c91f5e2b7d
+Revises: 0efecc1e0d86
+Create Date: 2026-10-18 09:12:41.381204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c91f5e2b7d'
+down_revision: Union[str, Sequence[str], None] = '0efecc1e0d86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_chat_messages_conversation',
+        'chat_messages',
+        ['sender_id', 'receiver_id', 'timestamp', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_chat_messages_conversation', table_name='chat_messages')
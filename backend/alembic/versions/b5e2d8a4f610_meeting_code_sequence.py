@@ -0,0 +1,31 @@
+"""Sequenz für die Vergabe von Meeting-Codes
+
+Revision ID: b5e2d8a4f610
+Revises: 8a3f6c1d9e27
+Create Date: 2026-10-18 18:41:09.552871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e2d8a4f610'
+down_revision: Union[str, Sequence[str], None] = '8a3f6c1d9e27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nur PostgreSQL; andere Datenbanken zählen im Prozess (siehe functions/meeting_codes.py)
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(sa.schema.CreateSequence(sa.Sequence('meeting_code_seq')))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(sa.schema.DropSequence(sa.Sequence('meeting_code_seq')))
@@ -0,0 +1,47 @@
+"""Tabelle conversation_state für materialisierte Ungelesen-Zähler
+
+Revision ID: c7f2a9d41e63
+Revises: 5d8e0b4a7c12
+Create Date: 2026-10-18 11:26:52.117830
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7f2a9d41e63'
+down_revision: Union[str, Sequence[str], None] = '5d8e0b4a7c12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('conversation_state',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('contact_id', sa.Integer(), nullable=False),
+    sa.Column('unread_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['contact_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'contact_id')
+    )
+    # Zähler für bestehende Freundschaften einmalig aus chat_messages befüllen
+    op.execute("""
+        INSERT INTO conversation_state (user_id, contact_id, unread_count, updated_at)
+        SELECT f.user_id, f.friend_id,
+               (SELECT COUNT(*) FROM chat_messages m
+                WHERE m.receiver_id = f.user_id
+                  AND m.sender_id = f.friend_id
+                  AND m.timestamp > f.timestamp),
+               CURRENT_TIMESTAMP
+        FROM friends f
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('conversation_state')
@@ -0,0 +1,46 @@
+"""Tabellen meeting_recordings und recording_tracks für Aufnahmen über mehrere Worker
+
+Revision ID: d3e8f1a7b240
+Revises: b5e2d8a4f610
+Create Date: 2026-10-18 21:12:47.318604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3e8f1a7b240'
+down_revision: Union[str, Sequence[str], None] = 'b5e2d8a4f610'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('meeting_recordings',
+    sa.Column('meeting_code', sa.String(length=10), nullable=False),
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('open_tracks', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('meeting_code'),
+    sa.UniqueConstraint('id')
+    )
+    op.create_table('recording_tracks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recording_id', sa.String(length=32), nullable=False),
+    sa.Column('meeting_code', sa.String(length=10), nullable=False),
+    sa.Column('track', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_recording_tracks_recording_id'), 'recording_tracks', ['recording_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_recording_tracks_recording_id'), table_name='recording_tracks')
+    op.drop_table('recording_tracks')
+    op.drop_table('meeting_recordings')
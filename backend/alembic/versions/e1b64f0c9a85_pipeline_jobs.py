@@ -0,0 +1,45 @@
+"""Tabelle pipeline_jobs für Hintergrund-Jobs
+
+Revision ID: e1b64f0c9a85
+Revises: c7f2a9d41e63
+Create Date: 2026-10-18 14:41:09.552371
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1b64f0c9a85'
+down_revision: Union[str, Sequence[str], None] = 'c7f2a9d41e63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('pipeline_jobs',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('meeting_code', sa.String(length=10), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('stage', sa.String(length=30), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('audio_path', sa.String(length=500), nullable=True),
+    sa.Column('transcript', sa.Text(), nullable=True),
+    sa.Column('result', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_pipeline_jobs_status'), 'pipeline_jobs', ['status'], unique=False)
+    op.create_index('ix_pipeline_jobs_meeting', 'pipeline_jobs', ['meeting_code', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_pipeline_jobs_meeting', table_name='pipeline_jobs')
+    op.drop_index(op.f('ix_pipeline_jobs_status'), table_name='pipeline_jobs')
+    op.drop_table('pipeline_jobs')
@@ -0,0 +1,41 @@
+"""Tabelle meeting_summaries für dauerhafte Zusammenfassungen
+
+Revision ID: f4a0d2c87b19
+Revises: e1b64f0c9a85
+Create Date: 2026-10-18 15:58:30.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a0d2c87b19'
+down_revision: Union[str, Sequence[str], None] = 'e1b64f0c9a85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('meeting_summaries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('meeting_code', sa.String(length=10), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('transcript', sa.Text(), nullable=True),
+    sa.Column('summary', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_meeting_summaries_id'), 'meeting_summaries', ['id'], unique=False)
+    op.create_index(op.f('ix_meeting_summaries_meeting_code'), 'meeting_summaries', ['meeting_code'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_meeting_summaries_meeting_code'), table_name='meeting_summaries')
+    op.drop_index(op.f('ix_meeting_summaries_id'), table_name='meeting_summaries')
+    op.drop_table('meeting_summaries')
@@ -1,20 +1,90 @@
-from sqlalchemy import create_engine
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from .functions import metrics
+
 # 1. Die Verbindungs-URL
 # Diese Zeile sagt SQLAlchemy, wo sich Ihre Datenbank befindet und wie man sich verbindet.
-DATABASE_URL = "postgresql://yunus@localhost/ai_meeting_db"
+# Über DATABASE_URL überschreibbar (z.B. "sqlite:///./test.db" für Tests).
+DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://yunus@localhost/ai_meeting_db")
+
+def to_async_url(url: str) -> str:
+    """Leitet aus der synchronen URL die passende Async-URL ab (asyncpg bzw. aiosqlite)."""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+def pool_options(url: str) -> dict:
+    """
+    Pool-Einstellungen aus der Umgebung (DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE, DB_POOL_PRE_PING). SQLite nutzt eigene Pools ohne diese Optionen.
+    """
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+    }
 
 # 2. Die "Engine"
 # Die Engine ist das Herzstück der Verbindung. Sie verwaltet die Verbindungen zur Datenbank.
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **pool_options(DATABASE_URL))
+
+# Async-Engine für die `async def`-Endpunkte und WebSockets,
+# damit ein langsamer Commit nicht den Event-Loop blockiert.
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **pool_options(ASYNC_DATABASE_URL))
+
+# Pool-Metriken: Checkouts, neue Verbindungen und aktuell ausgeliehene Verbindungen.
+# Die Pool-Events kommen aus verschiedenen Threads, daher ist der Zähler per Lock geschützt.
+def register_pool_metrics(pool, name: str):
+    checked_out = 0
+    lock = threading.Lock()
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.increment(f"db.{name}.connections_opened")
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        nonlocal checked_out
+        with lock:
+            checked_out += 1
+            metrics.set_gauge(f"db.{name}.checked_out", checked_out)
+        metrics.increment(f"db.{name}.checkouts")
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        nonlocal checked_out
+        with lock:
+            checked_out -= 1
+            metrics.set_gauge(f"db.{name}.checked_out", checked_out)
+
+register_pool_metrics(engine.pool, "sync")
+register_pool_metrics(async_engine.sync_engine.pool, "async")
 
 # 3. Die "Session"
 # Eine Session ist quasi ein einzelnes "Gespräch" mit der Datenbank.
 # Hiermit erstellen wir eine Vorlage für diese Gespräche.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# expire_on_commit=False: Nach dem Commit bleiben die Attribute lesbar,
+# ohne dass ein (im Async-Kontext verbotenes) implizites Nachladen ausgelöst wird.
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 # 4. Die "Base"-Klasse
 # Alle Ihre Datenbank-Modelle in `models.py` werden von dieser Klasse erben.
 # Sie hilft SQLAlchemy, die Python-Klassen auf Datenbank-Tabellen abzubilden.
@@ -23,9 +93,29 @@ Base = declarative_base()
 # 5. Die Dependency-Funktion
 # Diese Funktion wird von jedem API-Endpunkt aufgerufen, der mit der Datenbank sprechen muss.
 # Sie stellt eine frische Session zur Verfügung und schließt sie danach automatisch wieder.
+# Die Verbindung wird gleich zu Beginn geholt, damit die Wartezeit auf den Pool messbar ist.
 def get_db():
     db = SessionLocal()
     try:
+        start = time.perf_counter()
+        db.connection()
+        metrics.observe("db.sync.checkout_wait", time.perf_counter() - start)
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# 6. Die Async-Session
+# Kurzlebige Session für genau eine Operation. Langlebige WebSockets öffnen damit pro
+# Nachricht eine eigene Session, statt eine Verbindung für die ganze Laufzeit zu belegen.
+@asynccontextmanager
+async def async_session_scope():
+    async with AsyncSessionLocal() as db:
+        start = time.perf_counter()
+        await db.connection()
+        metrics.observe("db.async.checkout_wait", time.perf_counter() - start)
+        yield db
+
+# Gegenstück zu get_db für `async def`-Endpunkte.
+async def get_async_db():
+    async with async_session_scope() as db:
+        yield db
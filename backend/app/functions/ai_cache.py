@@ -0,0 +1,114 @@
+# In backend/app/functions/ai_cache.py
+#
+# Inhaltsadressierter Cache für KI-Ergebnisse auf der Festplatte: Transkripte werden
+# über den Hash der Audiodatei gefunden, Zusammenfassungen über den Hash des
+# Transkripts plus Prompt-Version. Wird dieselbe Aufnahme erneut verarbeitet
+# (Retry, Reconnect), fallen keine STT- oder Gemini-Kosten mehr an.
+#
+# AI_CACHE_DIR      Verzeichnis (Standard: <tmp>/ai-meeting-cache)
+# AI_CACHE_MAX_MB   Maximale Größe; die am längsten nicht genutzten Einträge werden verdrängt
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from . import metrics
+
+AI_CACHE_DIR = os.getenv("AI_CACHE_DIR", os.path.join(tempfile.gettempdir(), "ai-meeting-cache"))
+AI_CACHE_MAX_BYTES = int(os.getenv("AI_CACHE_MAX_MB", "200")) * 1024 * 1024
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_text(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    JSON-Werte als Dateien <namespace>/<key>.json. Zugriff aktualisiert die mtime,
+    verdrängt wird nach ältester mtime (LRU), sobald max_bytes überschritten ist.
+    """
+
+    def __init__(self, directory: str = AI_CACHE_DIR, max_bytes: int = AI_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: int | None = None  # wird beim ersten Schreiben ermittelt
+
+    def _path(self, namespace: str, key: str) -> str:
+        return os.path.join(self.directory, namespace, f"{key}.json")
+
+    def get(self, namespace: str, key: str):
+        path = self._path(namespace, key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                value = json.load(file)
+            os.utime(path)  # als zuletzt genutzt markieren
+        except (FileNotFoundError, ValueError):
+            metrics.increment(f"ai_cache.{namespace}.miss")
+            return None
+        metrics.increment(f"ai_cache.{namespace}.hit")
+        return value
+
+    def set(self, namespace: str, key: str, value):
+        path = self._path(namespace, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        # Erst temporär schreiben, dann atomar umbenennen: kein halber Eintrag bei Absturz
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(data)
+        with self._lock:
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data) - previous
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        # Auf 90 % der Grenze verkleinern, damit nicht bei jedem Schreiben verdrängt wird
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in sorted(self._entries()):
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._size -= size
+            metrics.increment("ai_cache.evicted")
+
+
+ai_cache = DiskCache()
@@ -0,0 +1,208 @@
+# In backend/app/functions/audio_ingest.py
+#
+# Annahme der Meeting-Audiospuren: Jede Audio-Verbindung schreibt gepuffert in eine
+# eigene Spur im Spool-Verzeichnis, begrenzt durch eine Quote pro Meeting. Erst wenn
+# die letzte Spur eines Meetings geschlossen ist, werden alle Spuren (mit Sprecher)
+# zusammen als EIN Transkriptions-Job übergeben.
+#
+# Zahl der offenen Spuren und die geschlossenen Spuren liegen in der Datenbank
+# (meeting_recordings / recording_tracks), damit das auch gilt, wenn die Teilnehmer
+# eines Meetings auf verschiedenen Workern verbunden sind. Die Quote zählt pro Worker.
+#
+# AUDIO_SPOOL_DIR          Verzeichnis für die Aufnahmen (Standard: <tmp>/ai-meeting-audio)
+# AUDIO_WRITE_BUFFER_KB    Schreibpuffer pro Spur (Standard: 256 KB)
+# AUDIO_MEETING_QUOTA_MB   Maximale Aufnahmegröße pro Meeting über alle Spuren (Standard: 500 MB)
+
+import os
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from .. import database, models
+from . import metrics
+
+AUDIO_SPOOL_DIR = os.getenv("AUDIO_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "ai-meeting-audio"))
+AUDIO_WRITE_BUFFER = int(os.getenv("AUDIO_WRITE_BUFFER_KB", "256")) * 1024
+AUDIO_MEETING_QUOTA = int(os.getenv("AUDIO_MEETING_QUOTA_MB", "500")) * 1024 * 1024
+
+
+@dataclass
+class AudioTrack:
+    meeting_code: str
+    user_id: int
+    speaker: str
+    path: str
+    started_at: float = field(default_factory=time.time)
+    bytes_written: int = 0
+    # Finale Stream-Ergebnisse als (Sekunden seit Spurbeginn, Text)
+    segments: list[tuple[float, str]] = field(default_factory=list)
+    stream_failed: bool = False
+    recording_id: str | None = None
+    _file: object = None
+
+    def add_segment(self, text: str):
+        self.segments.append((round(time.time() - self.started_at, 2), text))
+
+    def to_dict(self) -> dict:
+        """Beschreibung für den Job; segments=None heißt: Spur muss noch transkribiert werden."""
+        usable = self.segments and not self.stream_failed
+        return {
+            "user_id": self.user_id,
+            "speaker": self.speaker,
+            "path": self.path,
+            "started_at": self.started_at,
+            "segments": [list(segment) for segment in self.segments] if usable else None,
+        }
+
+
+@dataclass
+class LocalRecording:
+    """Lokaler Anteil eines Meetings an diesem Worker (für die Quote)."""
+    open_tracks: int = 0
+    bytes_written: int = 0
+
+
+class AudioIngest:
+    def __init__(self, spool_dir: str = AUDIO_SPOOL_DIR, buffer_size: int = AUDIO_WRITE_BUFFER,
+                 quota_bytes: int = AUDIO_MEETING_QUOTA, session_factory=database.async_session_scope):
+        self.spool_dir = spool_dir
+        self.buffer_size = buffer_size
+        self.quota_bytes = quota_bytes
+        self.session_factory = session_factory
+        self._meetings: dict[str, LocalRecording] = {}
+        self._lock = threading.Lock()
+
+    async def open_track(self, meeting_code: str, user_id: int, speaker: str) -> AudioTrack:
+        directory = os.path.join(self.spool_dir, meeting_code)
+        os.makedirs(directory, exist_ok=True)
+        # Eine Datei pro Verbindung: Jede neue MediaRecorder-Aufnahme beginnt mit eigenem WebM-Header
+        path = os.path.join(directory, f"{user_id}-{uuid.uuid4().hex[:8]}.webm")
+        track = AudioTrack(meeting_code=meeting_code, user_id=user_id, speaker=speaker, path=path)
+        track.recording_id = await self._register_track(meeting_code)
+        track._file = open(path, "wb", buffering=self.buffer_size)
+        with self._lock:
+            recording = self._meetings.setdefault(meeting_code, LocalRecording())
+            recording.open_tracks += 1
+        return track
+
+    def write(self, track: AudioTrack, chunk: bytes) -> bool:
+        """Schreibt einen Chunk gepuffert. False, wenn die Quote des Meetings erschöpft ist."""
+        with self._lock:
+            recording = self._meetings[track.meeting_code]
+            if recording.bytes_written + len(chunk) > self.quota_bytes:
+                metrics.increment("audio.quota_exceeded")
+                return False
+            recording.bytes_written += len(chunk)
+        track._file.write(chunk)
+        track.bytes_written += len(chunk)
+        metrics.increment("audio.bytes_received", len(chunk))
+        return True
+
+    async def close_track(self, track: AudioTrack) -> list[dict] | None:
+        """
+        Schließt eine Spur. Ist es die letzte offene Spur des Meetings (über alle Worker),
+        werden alle nicht-leeren Spuren zurückgegeben (für genau einen Job); sonst None.
+        """
+        if track._file is not None:
+            track._file.close()
+            track._file = None
+        with self._lock:
+            recording = self._meetings[track.meeting_code]
+            recording.open_tracks -= 1
+            if recording.open_tracks == 0:
+                del self._meetings[track.meeting_code]
+
+        tracks = await self._finish_track(track)
+        if track.bytes_written == 0:
+            remove_track_file(track.path)
+        return tracks
+
+    async def _register_track(self, meeting_code: str) -> str:
+        # Upsert: erste Spur legt die Aufnahme an, jede weitere zählt hoch. Die ID trennt
+        # eine neue Aufnahme (nach Abschluss der vorigen) von der alten.
+        now = datetime.utcnow()
+        async with self.session_factory() as db:
+            dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+            stmt = dialect.insert(models.MeetingRecording).values(
+                meeting_code=meeting_code, id=uuid.uuid4().hex, open_tracks=1, updated_at=now
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[models.MeetingRecording.meeting_code],
+                set_={"open_tracks": models.MeetingRecording.open_tracks + 1, "updated_at": now}
+            ).returning(models.MeetingRecording.id)
+            recording_id = (await db.execute(stmt)).scalar_one()
+            await db.commit()
+        return recording_id
+
+    async def _finish_track(self, track: AudioTrack) -> list[dict] | None:
+        # Eine Transaktion: Spur ablegen, herunterzählen und – bei 0 – die Aufnahme samt
+        # Spuren entnehmen. Die Zeilensperre aus dem UPDATE sorgt dafür, dass genau der
+        # Worker mit der letzten Spur den Job startet.
+        recording = models.MeetingRecording
+        async with self.session_factory() as db:
+            if track.bytes_written > 0:
+                await db.execute(insert(models.RecordingTrack).values(
+                    recording_id=track.recording_id, meeting_code=track.meeting_code,
+                    track=track.to_dict(), created_at=datetime.utcnow()
+                ))
+            open_tracks = await db.scalar(
+                update(recording).where(recording.id == track.recording_id).values(
+                    open_tracks=recording.open_tracks - 1, updated_at=datetime.utcnow()
+                ).returning(recording.open_tracks)
+            )
+            tracks = None
+            if open_tracks == 0:
+                await db.execute(delete(recording).where(recording.id == track.recording_id))
+                rows = await db.scalars(
+                    select(models.RecordingTrack.track).where(
+                        models.RecordingTrack.recording_id == track.recording_id
+                    ).order_by(models.RecordingTrack.id)
+                )
+                tracks = list(rows)
+                await db.execute(delete(models.RecordingTrack).where(
+                    models.RecordingTrack.recording_id == track.recording_id
+                ))
+            await db.commit()
+        return tracks
+
+
+def remove_track_file(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+    # Leeres Meeting-Verzeichnis mit aufräumen
+    directory = os.path.dirname(path)
+    try:
+        os.rmdir(directory)
+    except OSError:
+        pass
+
+
+def merge_tracks(tracks: list[dict]) -> str:
+    """
+    Führt die Transkripte aller Spuren zu einem Sprecher-markierten Transkript zusammen,
+    sortiert nach absoluter Zeit (Spurbeginn + Segment-Offset).
+    """
+    lines = []
+    for track in tracks:
+        for offset, text in track["segments"] or []:
+            if text:
+                lines.append((track["started_at"] + offset, track["speaker"], text))
+    lines.sort(key=lambda line: line[0])
+
+    merged = []
+    for _, speaker, text in lines:
+        # Aufeinanderfolgende Segmente desselben Sprechers zu einem Absatz zusammenfassen
+        if merged and merged[-1][0] == speaker:
+            merged[-1][1].append(text)
+        else:
+            merged.append((speaker, [text]))
+    return "\n".join(f"{speaker}: {' '.join(texts)}" for speaker, texts in merged)
+
+
+audio_ingest = AudioIngest()
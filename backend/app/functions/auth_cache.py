@@ -0,0 +1,83 @@
+# In backend/app/functions/auth_cache.py
+#
+# Cache für bereits geprüfte Access-Tokens: Token -> Benutzer. Ein Treffer spart die
+# JWT-Prüfung und das SELECT auf users. Einträge leben höchstens AUTH_CACHE_TTL
+# Sekunden und nie länger als das Token selbst (exp). Nach Änderungen an einem
+# Benutzer muss invalidate_user() aufgerufen werden.
+#
+# Die gecachten User-Objekte sind von ihrer Session getrennt und nur zum Lesen gedacht.
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from . import metrics
+
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+
+
+class PrincipalCache:
+    def __init__(self, ttl: float = AUTH_CACHE_TTL, max_entries: int = AUTH_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._tokens_by_user: dict[int, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                metrics.increment("auth_cache.miss")
+                return None
+            expires_at, user = entry
+            if expires_at <= time.time():
+                self._remove(token)
+                metrics.increment("auth_cache.miss")
+                return None
+            self._entries.move_to_end(token)
+        metrics.increment("auth_cache.hit")
+        return user
+
+    def put(self, token: str, user, token_expires_at: float | None = None):
+        expires_at = time.time() + self.ttl
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        with self._lock:
+            self._remove(token)
+            self._entries[token] = (expires_at, user)
+            self._tokens_by_user.setdefault(user.id, set()).add(token)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def invalidate_user(self, user_id: int):
+        """Alle gecachten Tokens eines Benutzers verwerfen (z.B. nach Profil- oder Passwortänderung)."""
+        with self._lock:
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._remove(token)
+
+    def invalidate_token(self, token: str):
+        with self._lock:
+            self._remove(token)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def _remove(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        user_id = entry[1].id
+        tokens = self._tokens_by_user.get(user_id)
+        if tokens:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[user_id]
+
+
+principal_cache = PrincipalCache()
@@ -0,0 +1,199 @@
+# In backend/app/functions/broker.py
+#
+# Pub/Sub-Broker für die WebSocket-Manager. Jede Nachricht an einen Benutzer bzw. ein
+# Meeting wird über den Broker veröffentlicht; jeder Worker abonniert die Kanäle und
+# stellt sie an seine lokal verbundenen Sockets zu. So funktionieren Chat und
+# Signaling auch mit mehreren uvicorn-Workern bzw. Nodes.
+#
+# BROKER_URL:
+#   memory://          -> InMemoryBroker (Standard, nur ein Prozess)
+#   redis://host:6379  -> RedisBroker (benötigt das Paket `redis`)
+
+import asyncio
+import os
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable
+
+from . import codec, metrics
+
+Handler = Callable[[dict], Awaitable[None]]
+
+CHANNEL_PREFIX = "ai-meeting:"
+
+# Wartezeit vor einem erneuten Verbindungsversuch zu Redis (verdoppelt sich bis zum Maximum)
+RECONNECT_DELAY = float(os.getenv("BROKER_RECONNECT_DELAY", "0.5"))
+RECONNECT_MAX_DELAY = float(os.getenv("BROKER_RECONNECT_MAX_DELAY", "30"))
+
+
+class Broker(ABC):
+    """Basisklasse: verwaltet die lokalen Abonnenten und verteilt eingehende Nachrichten."""
+
+    def __init__(self):
+        self._handlers: dict[str, list[Handler]] = {}
+
+    def subscribe(self, channel: str, handler: Handler):
+        new_channel = channel not in self._handlers
+        self._handlers.setdefault(channel, []).append(handler)
+        if new_channel:
+            self._channel_added(channel)
+
+    def _channel_added(self, channel: str):
+        """Hook für Backends, die neue Kanäle auch nach dem Start anmelden müssen."""
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    @abstractmethod
+    async def publish(self, channel: str, message: dict):
+        ...
+
+    async def _dispatch(self, channel: str, message: dict):
+        for handler in self._handlers.get(channel, []):
+            try:
+                await handler(message)
+            except Exception as e:
+                print(f"Fehler im Broker-Handler für Kanal {channel}: {e}")
+
+
+class InMemoryBroker(Broker):
+    """Stellt direkt im eigenen Prozess zu (ein Worker)."""
+
+    async def publish(self, channel: str, message: dict):
+        await self._dispatch(channel, message)
+
+
+class LocalHub:
+    """Gemeinsamer "Server" für mehrere LocalHubBroker, simuliert Redis in Tests."""
+
+    def __init__(self):
+        self.brokers: list["LocalHubBroker"] = []
+
+
+class LocalHubBroker(Broker):
+    """
+    Fake-Backend für Tests: mehrere Instanzen an einem LocalHub verhalten sich wie
+    mehrere Worker an einem Redis-Server (inkl. JSON-Serialisierung auf dem "Draht").
+    """
+
+    def __init__(self, hub: LocalHub):
+        super().__init__()
+        self.hub = hub
+        hub.brokers.append(self)
+
+    async def publish(self, channel: str, message: dict):
+        data = codec.dumps(message)
+        for broker in list(self.hub.brokers):
+            await broker._dispatch(channel, codec.loads(data))
+
+    async def stop(self):
+        if self in self.hub.brokers:
+            self.hub.brokers.remove(self)
+
+
+class RedisBroker(Broker):
+    """
+    Redis Pub/Sub über alle Worker und Nodes hinweg. Bricht die Verbindung ab, wird mit
+    wachsender Wartezeit neu verbunden und alle Kanäle erneut abonniert.
+    """
+
+    def __init__(self, url: str):
+        super().__init__()
+        self.url = url
+        self._redis = None
+        self._pubsub = None
+        self._task: asyncio.Task | None = None
+        self._pending: set[asyncio.Task] = set()
+
+    async def start(self):
+        import redis.asyncio as redis  # optionale Abhängigkeit, nur für dieses Backend nötig
+
+        self._redis = redis.from_url(self.url)
+        await self._connect()
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._pending):
+            task.cancel()
+        if self._pubsub:
+            await self._pubsub.aclose()
+        if self._redis:
+            await self._redis.aclose()
+
+    async def publish(self, channel: str, message: dict):
+        await self._redis.publish(CHANNEL_PREFIX + channel, codec.dumps(message))
+
+    def _channel_added(self, channel: str):
+        # Abonnements nach dem Start (z.B. Module, die erst später importiert werden)
+        # müssen auch bei Redis angemeldet werden, sonst kommt auf dem Kanal nie etwas an.
+        # subscribe() ist synchron, daher als Task; bei einem Fehler holt _listen es nach.
+        if self._task is None or self._pubsub is None:
+            return
+        task = asyncio.create_task(self._subscribe_late(channel))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _subscribe_late(self, channel: str):
+        try:
+            await self._pubsub.subscribe(CHANNEL_PREFIX + channel)
+        except Exception as e:
+            print(f"⚠️ Redis-Abonnement für {channel} fehlgeschlagen: {e}")
+
+    async def _connect(self):
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.aclose()
+            except Exception:
+                pass
+        self._pubsub = self._redis.pubsub()
+        if self._handlers:
+            await self._pubsub.subscribe(*(CHANNEL_PREFIX + channel for channel in self._handlers))
+
+    async def _listen(self):
+        delay = RECONNECT_DELAY
+        reconnect = False
+        while True:
+            try:
+                if reconnect:
+                    await self._connect()
+                    reconnect = False
+                if not self._pubsub.subscribed:
+                    # listen() endet sofort ohne Abonnement; auf das erste subscribe() warten
+                    await asyncio.sleep(RECONNECT_DELAY)
+                    continue
+                async for item in self._pubsub.listen():
+                    if item["type"] != "message":
+                        continue
+                    channel = item["channel"]
+                    if isinstance(channel, bytes):
+                        channel = channel.decode()
+                    await self._dispatch(channel[len(CHANNEL_PREFIX):], codec.loads(item["data"]))
+                    delay = RECONNECT_DELAY
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.increment("broker.reconnects")
+                print(f"⚠️ Redis-Verbindung verloren ({e}), neuer Versuch in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+                reconnect = True
+
+
+def create_broker(url: str) -> Broker:
+    if url.startswith("memory://"):
+        return InMemoryBroker()
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBroker(url)
+    raise ValueError(f"Unbekannte BROKER_URL: {url}")
+
+
+broker = create_broker(os.getenv("BROKER_URL", "memory://"))
@@ -0,0 +1,213 @@
+# In backend/app/functions/chat_writer.py
+#
+# Write-Behind-Persistenz für Chat-Nachrichten: Der WebSocket bekommt die fertige
+# Nachricht (inkl. ID und Zeitstempel) sofort zurück und liefert sie aus, gespeichert
+# wird gesammelt in kleinen Batches durch einen einzigen Hintergrund-Task.
+
+import asyncio
+import json
+import os
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+
+from sqlalchemy import func, insert, select, text, update
+from sqlalchemy.exc import DataError, IntegrityError
+
+from .. import database, models
+from . import metrics
+
+BATCH_SIZE = int(os.getenv("CHAT_WRITE_BATCH_SIZE", "200"))
+FLUSH_INTERVAL = int(os.getenv("CHAT_WRITE_FLUSH_MS", "50")) / 1000
+MAX_QUEUE = int(os.getenv("CHAT_WRITE_MAX_QUEUE", "10000"))
+ID_BLOCK_SIZE = 100
+MAX_RETRIES = 5
+MAX_MESSAGE_LENGTH = models.ChatMessage.__table__.c.message.type.length
+KNOWN_USERS_SIZE = 10000
+
+_STOP = object()
+
+
+class InvalidChatMessage(ValueError):
+    """Nachricht würde beim INSERT scheitern; wird vor dem Einreihen abgelehnt."""
+
+
+class MessageIdAllocator:
+    """
+    Reserviert Nachrichten-IDs blockweise im Voraus, damit eine Nachricht schon vor dem
+    INSERT ihre endgültige ID hat. PostgreSQL: aus der Sequenz von chat_messages.id.
+    Andere Datenbanken (SQLite in Tests): Zähler ab max(id), nur für einen Prozess gültig.
+    """
+
+    def __init__(self, session_factory, block_size: int = ID_BLOCK_SIZE):
+        self.session_factory = session_factory
+        self.block_size = block_size
+        self._ids: list[int] = []
+        self._next_local: int | None = None
+        self._lock = asyncio.Lock()
+
+    async def next_id(self) -> int:
+        async with self._lock:
+            if not self._ids:
+                self._ids = await self._reserve_block()
+            return self._ids.pop(0)
+
+    async def _reserve_block(self) -> list[int]:
+        async with self.session_factory() as db:
+            if db.bind.dialect.name == "postgresql":
+                result = await db.execute(
+                    text("SELECT nextval(pg_get_serial_sequence('chat_messages', 'id')) FROM generate_series(1, :n)"),
+                    {"n": self.block_size}
+                )
+                return [row[0] for row in result]
+
+            if self._next_local is None:
+                self._next_local = (await db.scalar(select(func.max(models.ChatMessage.id))) or 0) + 1
+        start = self._next_local
+        self._next_local += self.block_size
+        return list(range(start, start + self.block_size))
+
+
+class ChatMessageWriter:
+    def __init__(self, session_factory=database.async_session_scope,
+                 batch_size: int = BATCH_SIZE, flush_interval: float = FLUSH_INTERVAL,
+                 max_queue: int = MAX_QUEUE):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.ids = MessageIdAllocator(session_factory)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._task: asyncio.Task | None = None
+        self._known_users: OrderedDict[int, None] = OrderedDict()
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Beendet den Writer und schreibt vorher alle noch wartenden Nachrichten."""
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def submit(self, sender_id: int, receiver_id: int, message: str) -> dict:
+        """
+        Reiht eine Nachricht zum Speichern ein und gibt sie sofort mit ID und Zeitstempel zurück.
+        Ist die Warteschlange voll, wartet der Aufrufer (Backpressure statt Datenverlust).
+        Ungültige Nachrichten (Länge, unbekannter Empfänger) lösen InvalidChatMessage aus,
+        damit keine Zeile eingereiht wird, die später den ganzen Batch scheitern lässt.
+        """
+        await self.validate(receiver_id, message)
+        row = {
+            "id": await self.ids.next_id(),
+            "sender_id": sender_id,
+            "receiver_id": receiver_id,
+            "message": message,
+            "timestamp": datetime.now(timezone.utc),
+        }
+        await self._queue.put(row)
+        metrics.set_gauge("chat.write_queue_depth", self._queue.qsize())
+        return row
+
+    async def validate(self, receiver_id, message):
+        if not isinstance(message, str) or not message.strip():
+            raise InvalidChatMessage("empty_message")
+        if len(message) > MAX_MESSAGE_LENGTH:
+            raise InvalidChatMessage("message_too_long")
+        if not isinstance(receiver_id, int) or isinstance(receiver_id, bool):
+            raise InvalidChatMessage("invalid_receiver")
+        if not await self._user_exists(receiver_id):
+            raise InvalidChatMessage("unknown_receiver")
+
+    async def _user_exists(self, user_id: int) -> bool:
+        # Benutzer werden nicht gelöscht: bekannte IDs merken, nur neue Empfänger kosten ein SELECT
+        if user_id in self._known_users:
+            self._known_users.move_to_end(user_id)
+            return True
+        async with self.session_factory() as db:
+            exists = await db.scalar(select(models.User.id).where(models.User.id == user_id)) is not None
+        if exists:
+            self._known_users[user_id] = None
+            if len(self._known_users) > KNOWN_USERS_SIZE:
+                self._known_users.popitem(last=False)
+        return exists
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            # Kein wait_for(queue.get()): das kann (vor Python 3.12) bei gleichzeitigem Timeout
+            # eine bereits entnommene Nachricht verlieren. Stattdessen Fenster abwarten und
+            # nur synchron entnehmen; ist der Batch schon voll, wird nicht gewartet.
+            stopping = self._drain(batch)
+            if not stopping and len(batch) < self.batch_size:
+                await asyncio.sleep(self.flush_interval)
+                stopping = self._drain(batch)
+            await self._flush(batch)
+
+        # Beim Herunterfahren: alles, was noch in der Queue liegt, synchron wegschreiben
+        rest = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                rest.append(item)
+        for i in range(0, len(rest), self.batch_size):
+            await self._flush(rest[i:i + self.batch_size])
+
+    def _drain(self, batch: list) -> bool:
+        """Entnimmt ohne Warten bis zur Batch-Größe; True, wenn dabei das Stop-Signal kam."""
+        while len(batch) < self.batch_size and not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is _STOP:
+                return True
+            batch.append(item)
+        return False
+
+    async def _flush(self, batch: list[dict]):
+        delay = 0.1
+        for attempt in range(1, MAX_RETRIES + 1):
+            try:
+                with metrics.timed("chat.write_batch"):
+                    await self._write(batch)
+                metrics.increment("chat.messages_written", len(batch))
+                metrics.set_gauge("chat.write_queue_depth", self._queue.qsize())
+                return
+            except (IntegrityError, DataError) as e:
+                # Fehler in den Daten: Wiederholen hilft nicht. Batch halbieren, bis nur
+                # die fehlerhafte Zeile übrig bleibt – alle anderen werden gespeichert.
+                if len(batch) == 1:
+                    metrics.increment("chat.messages_rejected")
+                    print(f"❌ Chat-Nachricht {batch[0]['id']} verworfen: {e}")
+                    return
+                middle = len(batch) // 2
+                await self._flush(batch[:middle])
+                await self._flush(batch[middle:])
+                return
+            except Exception as e:
+                print(f"Fehler beim Speichern von {len(batch)} Chat-Nachrichten (Versuch {attempt}/{MAX_RETRIES}): {e}")
+                await asyncio.sleep(delay)
+                delay *= 2
+        # Endgültig gescheitert: vollständige Nachrichten ins Log, damit sie nachgetragen werden können
+        metrics.increment("chat.messages_lost", len(batch))
+        for row in batch:
+            print(f"❌ Chat-Nachricht nicht gespeichert: {json.dumps(row, default=str, ensure_ascii=False)}")
+
+    async def _write(self, batch: list[dict]):
+        # Ungelesen-Zähler pro (Empfänger, Absender) zusammenfassen: ein UPDATE pro Unterhaltung
+        unread = Counter((row["receiver_id"], row["sender_id"]) for row in batch)
+        async with self.session_factory() as db:
+            await db.execute(insert(models.ChatMessage), batch)
+            for (receiver_id, sender_id), count in unread.items():
+                await db.execute(
+                    update(models.ConversationState).where(
+                        models.ConversationState.user_id == receiver_id,
+                        models.ConversationState.contact_id == sender_id
+                    ).values(unread_count=models.ConversationState.unread_count + count)
+                )
+            await db.commit()
+
+chat_writer = ChatMessageWriter()
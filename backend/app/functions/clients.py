@@ -0,0 +1,73 @@
+# In backend/app/functions/clients.py
+#
+# Zentrale, lazy Registry für Cloud-Clients (Speech-to-Text, Cloud Storage, LLM).
+# Beim Import wird weder ein Cloud-SDK geladen noch nach Credentials gesucht; jeder
+# Client wird erst beim ersten Zugriff erzeugt und danach pro Prozess wiederverwendet.
+# Ein Worker ohne Google-Credentials startet also trotzdem, nur die KI-Funktionen
+# schlagen dann beim ersten Aufruf fehl.
+
+import threading
+
+
+class ClientRegistry:
+    def __init__(self):
+        self._factories = {}
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory):
+        self._factories[name] = factory
+
+    def get(self, name: str):
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+        with self._lock:
+            # Zweiter Blick unter dem Lock: nur ein Thread baut den Client
+            if name not in self._clients:
+                self._clients[name] = self._factories[name]()
+            return self._clients[name]
+
+    def loaded(self) -> list[str]:
+        return sorted(self._clients)
+
+    def reset(self, name: str | None = None):
+        """Verwirft gecachte Clients (z.B. nach Credential-Wechsel oder in Tests)."""
+        with self._lock:
+            if name is None:
+                self._clients.clear()
+            else:
+                self._clients.pop(name, None)
+
+
+def _create_speech_client():
+    from google.cloud import speech
+    return speech.SpeechClient()
+
+
+def _create_storage_client():
+    from google.cloud import storage
+    return storage.Client()
+
+
+def _create_llm_backend():
+    from .llm import create_llm_backend
+    return create_llm_backend()
+
+
+clients = ClientRegistry()
+clients.register("speech", _create_speech_client)
+clients.register("storage", _create_storage_client)
+clients.register("llm", _create_llm_backend)
+
+
+def get_speech_client():
+    return clients.get("speech")
+
+
+def get_storage_client():
+    return clients.get("storage")
+
+
+def get_llm_backend():
+    return clients.get("llm")
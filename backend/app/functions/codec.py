@@ -0,0 +1,33 @@
+# In backend/app/functions/codec.py
+#
+# JSON-Codec für die WebSocket-Pfade: nutzt orjson, wenn installiert, sonst die
+# Standardbibliothek. dumps() liefert immer einen fertigen str, der unverändert an
+# alle Empfänger eines Frames gesendet werden kann.
+
+import json
+from datetime import date, datetime
+
+try:
+    import orjson
+except ImportError:  # orjson ist optional
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    def dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(data: str | bytes):
+        return orjson.loads(data)
+else:
+    def dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=_default)
+
+    def loads(data: str | bytes):
+        return json.loads(data)
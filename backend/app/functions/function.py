@@ -1,19 +1,23 @@
 # In backend/app/functions.py
 
 from datetime import datetime, timedelta, timezone
-import random
 import secrets
-import string
 from jose import jwt, JWTError
 from fastapi import Depends, Query, WebSocketException, status, HTTPException
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import os
-import google.generativeai as genai
-from google.cloud import speech, storage
 
 # Importe wurden hier zusammengefasst und aufgeräumt
 from .. import models, database
+from .summarizer import PROMPT_VERSION, summarize_transcript
+from .llm import GEMINI_MODEL, LLM_BACKEND
+from .ai_cache import ai_cache, hash_file, hash_text
+from .auth_cache import principal_cache
+from .clients import get_speech_client, get_storage_client
+from .stt import STT_LANGUAGE, STT_MODEL
 
 def create_verification_token() -> str:
     """Generiert einen zufälligen Verification-Token"""
@@ -35,16 +39,27 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    # iat: Ausstellungszeit, macht jedes Token eindeutig (Schlüssel im principal_cache)
+    to_encode.update({"exp": expire, "iat": datetime.now(timezone.utc)})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='auth/login')
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
+def decode_access_token(token: str) -> tuple[int | None, float | None]:
+    """Prüft das JWT und gibt (user_id, exp als Unix-Zeit) zurück. Wirft JWTError bei ungültigem Token."""
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    return payload.get("user_id"), payload.get("exp")
+
+def get_current_user(token: str = Depends(oauth2_scheme)):
     """
     Überprüft das Token, liest die user_id aus und gibt das User-Objekt aus der DB zurück.
+    Bereits geprüfte Tokens kommen aus dem principal_cache (keine DB-Abfrage).
     """
+    user = principal_cache.get(token)
+    if user is not None:
+        return user
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -52,26 +67,35 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     )
     
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("user_id")
+        user_id, expires_at = decode_access_token(token)
         if user_id is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
     
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    # Session nur bei einem Cache-Miss öffnen
+    with database.SessionLocal() as db:
+        user = db.query(models.User).filter(models.User.id == user_id).first()
     if user is None:
         raise credentials_exception
-        
+
+    principal_cache.put(token, user, expires_at)
     return user
 
-def get_current_user_ws(
-    token: str | None = Query(None), 
-    db: Session = Depends(database.get_db)
+async def get_current_user_ws(
+    token: str | None = Query(None)
 ) -> models.User:
+    """
+    Authentifiziert eine WebSocket-Verbindung. Die DB-Session wird nur für die Abfrage
+    geöffnet und nicht für die gesamte Lebensdauer des Sockets gehalten.
+    """
     if token is None:
         raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Token fehlt.")
 
+    user = principal_cache.get(token)
+    if user is not None:
+        return user
+
     # HIER IST DIE KORREKTUR:
     credentials_exception = WebSocketException(
         code=status.WS_1008_POLICY_VIOLATION,
@@ -79,43 +103,45 @@ def get_current_user_ws(
     )
     
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("user_id")
+        user_id, expires_at = decode_access_token(token)
         if user_id is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
     
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    async with database.async_session_scope() as db:
+        user = await db.get(models.User, user_id)
     if user is None:
         raise credentials_exception
-        
-    return user
-
-
 
-def generate_unique_meeting_code(db: Session):
-    while True:
-        code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-
-        if not db.query(models.Meeting).filter(models.Meeting.meeting_code == code).first():
-            return code
-        
+    principal_cache.put(token, user, expires_at)
+    return user
 
-# Speech-to-Text Client initialisieren
-speech_client = speech.SpeechClient()
 
 def transcribe_audio_google(audio_file_path: str, bucket_name: str) -> str:
     """
     Lädt eine Audiodatei in Google Cloud Storage hoch und transkribiert sie
     mit der asynchronen Speech-to-Text API.
     """
-    if not speech_client:
+    try:
+        # Clients werden erst hier (einmal pro Prozess) erzeugt, siehe clients.py
+        from google.cloud import speech
+        speech_client = get_speech_client()
+        storage_client = get_storage_client()
+    except Exception as e:
+        print(f"Speech-to-Text-Dienst nicht verfügbar: {e}")
         return "Fehler: Speech-to-Text-Dienst ist nicht konfiguriert."
 
     try:
+        # Dieselbe Aufnahme (Retry, Reconnect) wurde schon transkribiert -> Ergebnis aus dem Cache.
+        # Sprache und Modell gehören zum Schlüssel, sonst käme ein anders erzeugtes Transkript zurück.
+        cache_key = hash_text(hash_file(audio_file_path), "google", STT_LANGUAGE, STT_MODEL)
+        cached = ai_cache.get("transcript", cache_key)
+        if cached is not None:
+            print("Transkript aus dem Cache.")
+            return cached
+
         # --- TEIL 1: DATEI IN DEN BUCKET HOCHLADEN ---
-        storage_client = storage.Client()
         bucket = storage_client.bucket(bucket_name)
         
         # Erstelle einen einzigartigen Namen für die Datei im Bucket
@@ -134,7 +160,8 @@ def transcribe_audio_google(audio_file_path: str, bucket_name: str) -> str:
         config = speech.RecognitionConfig(
             encoding=speech.RecognitionConfig.AudioEncoding.WEBM_OPUS,
             sample_rate_hertz=48000,
-            language_code="de-DE",
+            language_code=STT_LANGUAGE,
+            model=STT_MODEL,
             enable_automatic_punctuation=True, # Ein nettes Extra
         )
 
@@ -153,14 +180,14 @@ def transcribe_audio_google(audio_file_path: str, bucket_name: str) -> str:
         # Setze das Ergebnis zusammen
         transcript = " ".join(
             [result.alternatives[0].transcript for result in response.results]
-        )
-        return transcript.strip()
+        ).strip()
+        ai_cache.set("transcript", cache_key, transcript)
+        return transcript
 
     except Exception as e:
         print(f"Ein schwerwiegender Fehler ist bei der Google-Transkription aufgetreten: {e}")
         # Optional: Versuche, die Datei im Bucket trotzdem zu löschen, falls sie noch existiert
         try:
-            storage_client = storage.Client()
             bucket = storage_client.bucket(bucket_name)
             blob = bucket.blob(os.path.basename(audio_file_path))
             if blob.exists():
@@ -173,45 +200,23 @@ def transcribe_audio_google(audio_file_path: str, bucket_name: str) -> str:
 
 def summarize_with_gemini(transcript: str) -> str:
     """
-    Sendet ein Transkript an die Google Gemini API zur Zusammenfassung.
+    Fasst ein Transkript mit Gemini zusammen. Lange Transkripte werden hierarchisch
+    (Map-Reduce) zusammengefasst, siehe summarizer.py.
     """
-    # Authentifiziere dich bei der Gemini API mit deinem Schlüssel.
-    # Wichtig: Speichere diesen Schlüssel sicher, am besten als Umgebungsvariable.
-    try:
-        gemini_api_key = os.getenv("GEMINI_API_KEY")
-        if not gemini_api_key:
-            raise ValueError("Kein GEMINI_API_KEY in der .env-Datei gefunden!")
-        genai.configure(api_key=gemini_api_key)
-
-        # Erstelle das KI-Modell, das du benutzen willst
-        model = genai.GenerativeModel('gemini-2.5-flash-preview-09-2025')  # 'gemini-pro' ist auch eine Option
-
-        # Das ist deine Anweisung an die KI. Je genauer, desto besser das Ergebnis.
-        prompt = f"""
-        Du bist ein professioneller KI-Assistent, der für die Zusammenfassung von Business-Meetings zuständig ist.
-        
-        Deine Aufgabe ist es, das folgende Meeting-Transkript zu analysieren und eine präzise, gut strukturierte Zusammenfassung zu erstellen.
-        
-        Die Zusammenfassung muss folgende Abschnitte enthalten, wenn es relevant ist und sowas besprochen wurde:
-        
-        1.  **Hauptthemen:** Eine kurze Übersicht der besprochenen Themen.
-        2.  **Wichtige Entscheidungen:** Eine klare Liste aller getroffenen Entscheidungen.
-        3.  **To-Do-Punkte:** Eine Liste der vereinbarten Aufgaben (Action Items), idealerweise mit den verantwortlichen Personen, falls diese im Text genannt werden.
-        
-        Hier ist das Transkript:
-        ---
-        {transcript}
-        ---
-        """
+    # Schlüssel: Transkript + Prompt-Version + Modell, damit Prompt-Änderungen neu zusammenfassen
+    cache_key = hash_text(transcript, PROMPT_VERSION, LLM_BACKEND, GEMINI_MODEL)
+    cached = ai_cache.get("summary", cache_key)
+    if cached is not None:
+        print("Zusammenfassung aus dem Cache.")
+        return cached
 
+    try:
         print("Sende Transkript an Gemini zur Zusammenfassung...")
-        # Sende den Prompt an die KI und erhalte die Antwort
-        response = model.generate_content(prompt)
+        summary = summarize_transcript(transcript)
         print("Zusammenfassung erfolgreich empfangen.")
-        
-        return response.text
+        ai_cache.set("summary", cache_key, summary)
+        return summary
 
     except Exception as e:
         print(f"Fehler bei der Gemini-Zusammenfassung: {e}")
         return f"Fehler bei der Zusammenfassung: {e}"
-
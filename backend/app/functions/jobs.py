@@ -0,0 +1,340 @@
+# In backend/app/functions/jobs.py
+#
+# Hintergrund-Jobs für lange Verarbeitungsschritte (Transkription, Zusammenfassung).
+# Die Jobs laufen in einem Thread-Pool und blockieren damit nie den Event-Loop.
+# Der Zustand jedes Jobs liegt in einem austauschbaren Backend:
+#
+# JOB_BACKEND:
+#   memory   -> InMemoryJobBackend (Standard, ein Prozess, geht beim Neustart verloren)
+#   database -> DatabaseJobBackend (Tabelle pipeline_jobs, offene und verwaiste Jobs werden beim
+#               Start und danach alle JOB_RECLAIM_SECONDS übernommen)
+
+import asyncio
+import os
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta
+from typing import Callable
+
+from sqlalchemy import update
+
+from .. import database, models
+from . import metrics
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_DELAY = float(os.getenv("JOB_RETRY_DELAY", "5"))
+# Der ausführende Worker frischt updated_at laufender Jobs regelmäßig auf (Heartbeat).
+# Erst nach JOB_STALE_AFTER ohne Heartbeat gilt ein Job als verwaist (Worker abgestürzt)
+# und darf von einem anderen Worker übernommen werden.
+JOB_HEARTBEAT = float(os.getenv("JOB_HEARTBEAT_SECONDS", "30"))
+JOB_STALE_AFTER = timedelta(seconds=float(os.getenv("JOB_STALE_AFTER_SECONDS", "150")))
+# Wie oft jeder Worker nach verwaisten oder noch wartenden Jobs sucht und sie übernimmt
+JOB_RECLAIM_INTERVAL = float(os.getenv("JOB_RECLAIM_SECONDS", "60"))
+
+# Job-Status
+QUEUED = "queued"
+RUNNING = "running"
+RETRYING = "retrying"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class Job:
+    meeting_code: str
+    # Audiospuren des Meetings, siehe audio_ingest.AudioTrack.to_dict. Die Pfade zeigen in das
+    # AUDIO_SPOOL_DIR des Workers, der aufgenommen hat: Ohne gemeinsames Verzeichnis kann nur
+    # dieser Worker den Job ausführen (siehe JobQueue.runnable).
+    tracks: list[dict] | None = None
+    transcript: str | None = None
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    status: str = QUEUED
+    stage: str | None = None          # aktueller Schritt, z.B. "transcribing"
+    attempts: int = 0
+    error: str | None = None
+    result: str | None = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    updated_at: datetime = field(default_factory=datetime.utcnow)
+
+
+class JobBackend(ABC):
+    """Speichert den Zustand der Jobs."""
+
+    @abstractmethod
+    def save(self, job: Job) -> None:
+        ...
+
+    @abstractmethod
+    def latest_for_meeting(self, meeting_code: str) -> Job | None:
+        ...
+
+    @abstractmethod
+    def claim(self, job: Job) -> bool:
+        """
+        Übernimmt den Job atomar für diesen Worker (Status RUNNING). False, wenn ein
+        anderer Worker ihn schon hat – dann darf er hier nicht ausgeführt werden.
+        """
+
+    def heartbeat(self, job_ids: list[str]) -> None:
+        """Markiert die Jobs als noch in Arbeit."""
+
+    def unfinished(self) -> list[Job]:
+        """Jobs, die beim Start fortgesetzt werden müssen."""
+        return []
+
+
+class InMemoryJobBackend(JobBackend):
+    def __init__(self):
+        self._jobs: dict[str, Job] = {}
+        self._latest: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def save(self, job: Job) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+            self._latest[job.meeting_code] = job.id
+            # Abgeschlossene Jobs älterer Läufe nicht ewig aufheben
+            if len(self._jobs) > 1000:
+                live = set(self._latest.values())
+                for job_id in [j for j in self._jobs if j not in live]:
+                    del self._jobs[job_id]
+
+    def latest_for_meeting(self, meeting_code: str) -> Job | None:
+        with self._lock:
+            job_id = self._latest.get(meeting_code)
+            return self._jobs.get(job_id) if job_id else None
+
+    def claim(self, job: Job) -> bool:
+        with self._lock:
+            current = self._jobs.get(job.id, job)
+            if current.status not in (QUEUED, RETRYING):
+                return False
+            current.status = RUNNING
+            return True
+
+
+class DatabaseJobBackend(JobBackend):
+    """Persistiert die Jobs in der Tabelle pipeline_jobs (überlebt Neustarts)."""
+
+    def save(self, job: Job) -> None:
+        job.updated_at = datetime.utcnow()
+        with database.SessionLocal() as db:
+            db.merge(models.PipelineJob(**{f.name: getattr(job, f.name) for f in fields(Job)}))
+            db.commit()
+
+    def latest_for_meeting(self, meeting_code: str) -> Job | None:
+        with database.SessionLocal() as db:
+            row = db.query(models.PipelineJob).filter(
+                models.PipelineJob.meeting_code == meeting_code
+            ).order_by(models.PipelineJob.created_at.desc()).first()
+            return self._to_job(row) if row else None
+
+    @staticmethod
+    def _claimable(stale_before: datetime):
+        # Wartende Jobs immer; laufende/wiederholende nur ohne Heartbeat (Worker abgestürzt)
+        return (models.PipelineJob.status == QUEUED) | (
+            models.PipelineJob.status.in_((RUNNING, RETRYING)) &
+            (models.PipelineJob.updated_at < stale_before)
+        )
+
+    def claim(self, job: Job) -> bool:
+        # Bedingtes UPDATE: Nur ein Worker sieht rowcount == 1, alle anderen lassen den Job liegen
+        now = datetime.utcnow()
+        with database.SessionLocal() as db:
+            result = db.execute(
+                update(models.PipelineJob).where(
+                    models.PipelineJob.id == job.id,
+                    self._claimable(now - JOB_STALE_AFTER)
+                ).values(status=RUNNING, updated_at=now)
+            )
+            db.commit()
+            return result.rowcount == 1
+
+    def heartbeat(self, job_ids: list[str]) -> None:
+        with database.SessionLocal() as db:
+            db.execute(
+                update(models.PipelineJob).where(
+                    models.PipelineJob.id.in_(job_ids),
+                    models.PipelineJob.status.in_((RUNNING, RETRYING))
+                ).values(updated_at=datetime.utcnow())
+            )
+            db.commit()
+
+    def unfinished(self) -> list[Job]:
+        # Nur Kandidaten; ausgeführt wird ein Job erst nach erfolgreichem claim()
+        with database.SessionLocal() as db:
+            rows = db.query(models.PipelineJob).filter(
+                self._claimable(datetime.utcnow() - JOB_STALE_AFTER)
+            ).order_by(models.PipelineJob.created_at).all()
+            return [self._to_job(row) for row in rows]
+
+    @staticmethod
+    def _to_job(row: models.PipelineJob) -> Job:
+        return Job(**{f.name: getattr(row, f.name) for f in fields(Job)})
+
+
+def create_job_backend(name: str) -> JobBackend:
+    if name == "memory":
+        return InMemoryJobBackend()
+    if name == "database":
+        return DatabaseJobBackend()
+    raise ValueError(f"Unbekanntes JOB_BACKEND: {name}")
+
+
+class JobQueue:
+    """
+    Führt Jobs im Thread-Pool aus, mit Wiederholung und exponentiellem Backoff.
+
+    handler(job, set_stage) -> str  liefert das Ergebnis oder wirft bei Fehlern.
+    on_finished(job)                wird nach DONE oder endgültigem FAILED aufgerufen.
+    runnable(job) -> bool           ob dieser Worker einen übernommenen Job ausführen kann
+                                    (z.B. nur, wenn die Audiodateien lokal vorliegen).
+    """
+
+    def __init__(self, handler: Callable[[Job, Callable[[str], None]], str],
+                 backend: JobBackend, on_finished: Callable[[Job], None] | None = None,
+                 runnable: Callable[[Job], bool] | None = None,
+                 workers: int = JOB_WORKERS, max_attempts: int = JOB_MAX_ATTEMPTS,
+                 retry_delay: float = JOB_RETRY_DELAY):
+        self.handler = handler
+        self.backend = backend
+        self.on_finished = on_finished
+        self.runnable = runnable
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._executor: ThreadPoolExecutor | None = None
+        self._running: set[str] = set()   # übernommen und in Arbeit (für den Heartbeat)
+        self._pending: set[str] = set()   # an den Thread-Pool übergeben, noch nicht gestartet
+        self._running_lock = threading.Lock()
+        self._heartbeat_task: asyncio.Task | None = None
+        self._reclaim_task: asyncio.Task | None = None
+
+    async def start(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        await self._reclaim_once()
+        self._reclaim_task = asyncio.create_task(self._reclaim())
+
+    async def stop(self):
+        for task in (self._heartbeat_task, self._reclaim_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._heartbeat_task = None
+        self._reclaim_task = None
+        if self._executor:
+            # Laufende Jobs zu Ende bringen; wartende bleiben im (ggf. dauerhaften) Backend
+            await asyncio.to_thread(self._executor.shutdown, wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def submit(self, meeting_code: str, tracks: list[dict] | None = None,
+                     transcript: str | None = None) -> Job:
+        job = Job(meeting_code=meeting_code, tracks=tracks, transcript=transcript)
+        await asyncio.to_thread(self.backend.save, job)
+        self._enqueue(job)
+        metrics.increment("jobs.submitted")
+        return job
+
+    def status(self, meeting_code: str) -> Job | None:
+        return self.backend.latest_for_meeting(meeting_code)
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT)
+            with self._running_lock:
+                job_ids = list(self._running)
+            if job_ids:
+                try:
+                    await asyncio.to_thread(self.backend.heartbeat, job_ids)
+                except Exception as e:
+                    print(f"Heartbeat für {len(job_ids)} Jobs fehlgeschlagen: {e}")
+
+    async def _reclaim(self):
+        # Nicht nur beim Start: Stirbt ein Worker später, übernehmen die übrigen seine
+        # Jobs, sobald der Heartbeat länger als JOB_STALE_AFTER ausbleibt.
+        while True:
+            await asyncio.sleep(JOB_RECLAIM_INTERVAL)
+            try:
+                await self._reclaim_once()
+            except Exception as e:
+                print(f"Suche nach offenen Jobs fehlgeschlagen: {e}")
+
+    async def _reclaim_once(self):
+        for job in await asyncio.to_thread(self.backend.unfinished):
+            with self._running_lock:
+                known = job.id in self._running or job.id in self._pending
+            if known:
+                continue
+            if self.runnable and not self.runnable(job):
+                # Audiodateien liegen auf einem anderen Worker; der übernimmt den Job selbst
+                metrics.increment("jobs.reclaim_skipped")
+                continue
+            print(f"♻️ Setze Job {job.id} für Meeting {job.meeting_code} fort")
+            metrics.increment("jobs.reclaimed")
+            self._enqueue(job)
+
+    def _enqueue(self, job: Job):
+        with self._running_lock:
+            self._pending.add(job.id)
+        self._executor.submit(self._execute, job)
+
+    def _execute(self, job: Job):
+        with self._running_lock:
+            self._pending.discard(job.id)
+        # Nur Jobs ausführen, die dieser Worker tatsächlich übernommen hat
+        if not self.backend.claim(job):
+            metrics.increment("jobs.skipped")
+            return
+        with self._running_lock:
+            self._running.add(job.id)
+        try:
+            self._run_claimed(job)
+        finally:
+            with self._running_lock:
+                self._running.discard(job.id)
+
+    def _run_claimed(self, job: Job):
+        def set_stage(stage: str):
+            job.stage = stage
+            self.backend.save(job)
+
+        while True:
+            job.attempts += 1
+            job.status = RUNNING
+            self.backend.save(job)
+            try:
+                with metrics.timed("jobs.duration"):
+                    job.result = self.handler(job, set_stage)
+                job.status = DONE
+                job.stage = None
+                job.error = None
+                self.backend.save(job)
+                metrics.increment("jobs.done")
+                break
+            except Exception as e:
+                job.error = str(e)
+                print(f"Job {job.id} (Meeting {job.meeting_code}) fehlgeschlagen, Versuch {job.attempts}/{self.max_attempts}: {e}")
+                if job.attempts >= self.max_attempts:
+                    job.status = FAILED
+                    self.backend.save(job)
+                    metrics.increment("jobs.failed")
+                    break
+                job.status = RETRYING
+                self.backend.save(job)
+                metrics.increment("jobs.retried")
+                time.sleep(self.retry_delay * 2 ** (job.attempts - 1))
+
+        if self.on_finished:
+            try:
+                self.on_finished(job)
+            except Exception as e:
+                print(f"Fehler beim Abschluss von Job {job.id}: {e}")
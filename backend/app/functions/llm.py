@@ -0,0 +1,69 @@
+# In backend/app/functions/llm.py
+#
+# Austauschbares LLM-Backend für die Zusammenfassungen. Der Gemini-Client wird genau
+# einmal konfiguriert und das Modell für alle Aufrufe wiederverwendet.
+#
+# LLM_BACKEND:
+#   gemini -> GeminiBackend (Standard, benötigt GEMINI_API_KEY)
+#   stub   -> StubLLMBackend (deterministisch, für Tests)
+
+import os
+import threading
+from abc import ABC, abstractmethod
+
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash-preview-09-2025")
+
+
+class LLMBackend(ABC):
+    @abstractmethod
+    def generate(self, prompt: str) -> str:
+        ...
+
+
+class GeminiBackend(LLMBackend):
+    def __init__(self, model_name: str = GEMINI_MODEL):
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _get_model(self):
+        # Einmalige, threadsichere Konfiguration beim ersten Aufruf
+        with self._lock:
+            if self._model is None:
+                import google.generativeai as genai
+
+                gemini_api_key = os.getenv("GEMINI_API_KEY")
+                if not gemini_api_key:
+                    raise ValueError("Kein GEMINI_API_KEY in der .env-Datei gefunden!")
+                genai.configure(api_key=gemini_api_key)
+                self._model = genai.GenerativeModel(self.model_name)
+            return self._model
+
+    def generate(self, prompt: str) -> str:
+        return self._get_model().generate_content(prompt).text
+
+
+class StubLLMBackend(LLMBackend):
+    """
+    Deterministisch für Tests: gibt die erste Zeile des Prompts zurück, gefolgt von
+    der Anzahl der Zeichen. Alle Prompts werden in `prompts` mitprotokolliert.
+    """
+
+    def __init__(self):
+        self.prompts: list[str] = []
+        self._lock = threading.Lock()
+
+    def generate(self, prompt: str) -> str:
+        with self._lock:
+            self.prompts.append(prompt)
+        first_line = next((line.strip() for line in prompt.splitlines() if line.strip()), "")
+        return f"{first_line} ({len(prompt)} Zeichen)"
+
+
+def create_llm_backend(name: str = LLM_BACKEND) -> LLMBackend:
+    if name == "gemini":
+        return GeminiBackend()
+    if name == "stub":
+        return StubLLMBackend()
+    raise ValueError(f"Unbekanntes LLM_BACKEND: {name}")
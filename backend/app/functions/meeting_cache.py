@@ -0,0 +1,119 @@
+# In backend/app/functions/meeting_cache.py
+#
+# Cache für Meeting-Stammdaten (ID, Host, Passwort-Hash) nach meeting_code. Join, Leave
+# und die WebSockets fragen bei jedem Aufruf nach dem Meeting; beim Ansturm auf ein
+# großes Meeting geht so nur die erste Anfrage an die Datenbank. Gleichzeitige
+# Fehlschläge für denselben Code teilen sich eine Abfrage.
+#
+# Nur gefundene Meetings werden gecacht (ein gerade angelegtes Meeting ist sofort auf
+# allen Workern sichtbar). Wird ein Meeting geändert oder gelöscht, muss invalidate()
+# aufgerufen werden; das verteilt sich über den Broker auf alle Worker.
+# Derzeit gibt es keinen solchen Pfad: Meetings werden nur angelegt (POST /meeting/create),
+# Name, Host und Passwort sind danach unveränderlich. Neue Update- oder Delete-Endpunkte
+# (auch Skripte/Admin-Werkzeuge, die die Tabelle meetings ändern) müssen invalidate()
+# aufrufen, sonst gilt bis zu MEETING_CACHE_TTL der alte Stand.
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import select
+
+from .. import database, models
+from . import metrics
+from .broker import Broker, broker
+
+MEETING_CACHE_TTL = float(os.getenv("MEETING_CACHE_TTL", "300"))
+MEETING_CACHE_SIZE = int(os.getenv("MEETING_CACHE_SIZE", "10000"))
+MEETING_CACHE_CHANNEL = "meeting_cache"
+
+
+@dataclass(frozen=True)
+class MeetingInfo:
+    id: int
+    meeting_code: str
+    meeting_name: str
+    host_id: int
+    password: str  # SHA-256-Hash, wie in der Datenbank
+
+    @classmethod
+    def from_model(cls, meeting: models.Meeting) -> "MeetingInfo":
+        return cls(meeting.id, meeting.meeting_code, meeting.meeting_name, meeting.host_id, meeting.password)
+
+
+class MeetingCache:
+    def __init__(self, broker: Broker, session_factory=database.async_session_scope,
+                 ttl: float = MEETING_CACHE_TTL, max_entries: int = MEETING_CACHE_SIZE):
+        self.broker = broker
+        self.session_factory = session_factory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, MeetingInfo]] = OrderedDict()
+        self._loading: dict[str, asyncio.Future] = {}
+        broker.subscribe(MEETING_CACHE_CHANNEL, self._on_broker_message)
+
+    async def get(self, meeting_code: str) -> MeetingInfo | None:
+        entry = self._entries.get(meeting_code)
+        if entry is not None:
+            expires_at, meeting = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(meeting_code)
+                metrics.increment("meeting_cache.hit")
+                return meeting
+            del self._entries[meeting_code]
+        metrics.increment("meeting_cache.miss")
+
+        # Läuft schon eine Abfrage für diesen Code, auf deren Ergebnis warten
+        pending = self._loading.get(meeting_code)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # dieser Aufrufer selbst wurde abgebrochen
+                return await self.get(meeting_code)  # Ladender abgebrochen -> selbst laden
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[meeting_code] = future
+        try:
+            meeting = await self._load(meeting_code)
+            if meeting is not None:
+                self.put(meeting)
+            future.set_result(meeting)
+            return meeting
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # als abgerufen markieren, falls niemand wartet
+            raise
+        finally:
+            self._loading.pop(meeting_code, None)
+            # Abgebrochen (CancelledError, z.B. Client weg): Wartende nicht hängen lassen
+            if not future.done():
+                future.cancel()
+
+    def put(self, meeting: MeetingInfo):
+        self._entries.pop(meeting.meeting_code, None)
+        self._entries[meeting.meeting_code] = (time.monotonic() + self.ttl, meeting)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, meeting_code: str):
+        """Eintrag auf allen Workern verwerfen (nach Änderung oder Löschen des Meetings)."""
+        self._entries.pop(meeting_code, None)
+        await self.broker.publish(MEETING_CACHE_CHANNEL, {"meeting_code": meeting_code})
+
+    def clear(self):
+        self._entries.clear()
+
+    async def _load(self, meeting_code: str) -> MeetingInfo | None:
+        async with self.session_factory() as db:
+            meeting = await db.scalar(select(models.Meeting).where(models.Meeting.meeting_code == meeting_code))
+        return MeetingInfo.from_model(meeting) if meeting else None
+
+    async def _on_broker_message(self, envelope: dict):
+        self._entries.pop(envelope["meeting_code"], None)
+
+
+meeting_cache = MeetingCache(broker)
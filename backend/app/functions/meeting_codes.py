@@ -0,0 +1,102 @@
+# In backend/app/functions/meeting_codes.py
+#
+# Vergibt Meeting-Codes ohne "würfeln + SELECT"-Schleife: Jeder Code ist das Bild einer
+# fortlaufenden Nummer unter einer festen, geheimen Permutation des Code-Raums
+# (36^6 ≈ 2,2 Mrd.). Verschiedene Nummern ergeben garantiert verschiedene Codes, die
+# Codes wirken trotzdem zufällig und sind nicht aufzählbar.
+#
+# Die Nummern kommen blockweise aus der PostgreSQL-Sequenz meeting_code_seq (ein Roundtrip
+# pro Block statt einer Abfrage pro Versuch). Andere Datenbanken (SQLite in Tests): Zähler
+# ab zufälligem Startwert, nur für einen Prozess kollisionsfrei.
+#
+# Korrektheit sichert der Unique-Constraint auf meetings.meeting_code: Kollidiert ein Code
+# doch (ältere, zufällig erzeugte Codes; anderer Schlüssel), nimmt der Aufrufer den nächsten.
+
+import asyncio
+import hashlib
+import os
+import random
+import string
+
+from sqlalchemy import text
+
+from .. import database
+
+ALPHABET = string.ascii_uppercase + string.digits
+CODE_LENGTH = 6
+CODE_SPACE = len(ALPHABET) ** CODE_LENGTH
+BLOCK_SIZE = int(os.getenv("MEETING_CODE_BLOCK_SIZE", "50"))
+SEQUENCE = "meeting_code_seq"
+FEISTEL_ROUNDS = 4
+
+
+def _round_keys(secret: str) -> list[bytes]:
+    digest = hashlib.sha256(f"meeting-code:{secret}".encode()).digest()
+    return [digest[i * 8:(i + 1) * 8] for i in range(FEISTEL_ROUNDS)]
+
+
+def _feistel(value: int, keys: list[bytes]) -> int:
+    # Feistel-Netz über 32 Bit (2 x 16 Bit) – bijektiv, egal welche Rundenfunktion
+    left, right = value >> 16, value & 0xFFFF
+    for key in keys:
+        f = int.from_bytes(hashlib.blake2b(right.to_bytes(2, "big"), key=key, digest_size=2).digest(), "big")
+        left, right = right, left ^ f
+    return (left << 16) | right
+
+
+def permute(number: int, keys: list[bytes]) -> int:
+    """Bijektion auf [0, CODE_SPACE): Cycle-Walking, bis das Ergebnis im Code-Raum liegt."""
+    value = number % CODE_SPACE
+    while True:
+        value = _feistel(value, keys)
+        if value < CODE_SPACE:
+            return value
+
+
+def encode(value: int) -> str:
+    chars = []
+    for _ in range(CODE_LENGTH):
+        value, digit = divmod(value, len(ALPHABET))
+        chars.append(ALPHABET[digit])
+    return "".join(reversed(chars))
+
+
+class MeetingCodeAllocator:
+    def __init__(self, session_factory=database.async_session_scope, dialect: str | None = None,
+                 secret: str | None = None, block_size: int = BLOCK_SIZE):
+        self.session_factory = session_factory
+        self.dialect = dialect or database.async_engine.dialect.name
+        self.block_size = block_size
+        secret = secret if secret is not None else os.getenv("MEETING_CODE_KEY") or os.getenv("SECRET_KEY")
+        if not secret:
+            # Ohne Schlüssel wäre die Permutation öffentlich und die Codes vorhersagbar
+            raise ValueError("Kein MEETING_CODE_KEY oder SECRET_KEY in der .env-Datei gefunden!")
+        self._keys = _round_keys(secret)
+        self._numbers: list[int] = []
+        self._next_local: int | None = None
+        self._lock = asyncio.Lock()
+
+    async def next_code(self) -> str:
+        async with self._lock:
+            if not self._numbers:
+                self._numbers = await self._reserve_block()
+            number = self._numbers.pop(0)
+        return encode(permute(number, self._keys))
+
+    async def _reserve_block(self) -> list[int]:
+        if self.dialect == "postgresql":
+            async with self.session_factory() as db:
+                result = await db.execute(
+                    text(f"SELECT nextval('{SEQUENCE}') FROM generate_series(1, :n)"),
+                    {"n": self.block_size}
+                )
+                return [row[0] for row in result]
+
+        if self._next_local is None:
+            self._next_local = random.randrange(CODE_SPACE)
+        start = self._next_local
+        self._next_local += self.block_size
+        return list(range(start, start + self.block_size))
+
+
+meeting_codes = MeetingCodeAllocator()
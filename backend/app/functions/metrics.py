@@ -0,0 +1,88 @@
+# In backend/app/functions/metrics.py
+#
+# Einfache In-Process-Metriken (Zähler, Gauges, Latenzen), abrufbar über GET /metrics.
+# Bewusst ohne externe Abhängigkeit; jeder Worker meldet seine eigenen Werte.
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class LatencyStats:
+    """Sammelt Anzahl, Summe und Maximum von Dauern (in Sekunden)."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def snapshot(self) -> dict:
+        avg = self.total / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "avg_ms": round(avg * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+_lock = threading.Lock()
+_counters: dict[str, int] = {}
+_gauges: dict[str, float] = {}
+_latencies: dict[str, LatencyStats] = {}
+
+
+def increment(name: str, amount: int = 1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def set_gauge(name: str, value: float):
+    with _lock:
+        _gauges[name] = value
+
+
+def remove_gauge(name: str):
+    with _lock:
+        _gauges.pop(name, None)
+
+
+def remove_prefix(prefix: str):
+    """Entfernt alle Zähler, Gauges und Latenzen unter `prefix.` (z.B. eines beendeten Meetings)."""
+    start = prefix + "."
+    with _lock:
+        for store in (_counters, _gauges, _latencies):
+            for name in [name for name in store if name.startswith(start)]:
+                del store[name]
+
+
+def observe(name: str, seconds: float):
+    with _lock:
+        stats = _latencies.get(name)
+        if stats is None:
+            stats = _latencies[name] = LatencyStats()
+        stats.observe(seconds)
+
+
+@contextmanager
+def timed(name: str):
+    """Misst die Dauer des with-Blocks und trägt sie unter `name` ein."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "gauges": dict(_gauges),
+            "latencies": {name: stats.snapshot() for name, stats in _latencies.items()},
+        }
@@ -0,0 +1,53 @@
+# In backend/app/functions/password.py
+#
+# bcrypt-Hashing außerhalb des Event-Loops: Hash und Prüfung laufen in einem eigenen,
+# begrenzten Thread-Pool (bcrypt gibt dabei den GIL frei). Zusätzlich begrenzt ein
+# Limit die Zahl wartender Anfragen, damit ein Login-Sturm nicht unbegrenzt aufstaut.
+#
+# PASSWORD_HASH_WORKERS       Threads für bcrypt (Standard: Anzahl CPUs)
+# PASSWORD_HASH_MAX_PENDING   Max. gleichzeitig laufende + wartende Operationen (Standard: 64)
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from . import metrics
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_pending = 0
+
+
+async def _run(name: str, func, *args):
+    global _pending
+    if _pending >= PASSWORD_HASH_MAX_PENDING:
+        metrics.increment(f"auth.{name}_rejected")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Server ausgelastet, bitte erneut versuchen")
+    _pending += 1
+    metrics.set_gauge("auth.bcrypt_pending", _pending)
+    start = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+    finally:
+        _pending -= 1
+        metrics.set_gauge("auth.bcrypt_pending", _pending)
+        metrics.observe(f"auth.{name}", time.perf_counter() - start)
+
+
+async def hash_password(password: str) -> str:
+    # bcrypt hat ein 72-Byte-Limit
+    if len(password.encode('utf-8')) > 72:
+        password = password[:72]
+    return await _run("bcrypt_hash", pwd_context.hash, password)
+
+
+async def verify_password(password: str, password_hash: str) -> bool:
+    return await _run("bcrypt_verify", pwd_context.verify, password, password_hash)
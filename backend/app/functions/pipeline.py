@@ -0,0 +1,93 @@
+# In backend/app/functions/pipeline.py
+#
+# Die KI-Pipeline eines Meetings als Hintergrund-Job:
+# Audiospuren -> Transkripte (falls nicht schon aus dem Stream vorhanden)
+# -> zusammengeführtes Sprecher-Transkript -> Zusammenfassung.
+
+import asyncio
+import os
+
+from .function import transcribe_audio_google, summarize_with_gemini
+from .audio_ingest import merge_tracks, remove_track_file
+from .jobs import DONE, Job, JobQueue, create_job_backend
+from .summary_store import FAILED, PROCESSING, READY, summary_store
+from .summary_events import summary_notifier
+from .transcription import ffmpeg_available, transcribe_recording
+
+AUDIO_BUCKET = os.getenv("AUDIO_BUCKET", "ai-meeting-audio-bucket")
+JOB_BACKEND = os.getenv("JOB_BACKEND", "memory")
+
+NO_SPEECH_SUMMARY = "Im Meeting wurde keine Sprache erkannt."
+
+def process_meeting_audio(job: Job, set_stage) -> str:
+    """Läuft im Thread-Pool. Fehler werden geworfen, damit die JobQueue es erneut versucht."""
+    transcript = job.transcript
+    if not transcript:
+        set_stage("transcribing")
+        for track in job.tracks:
+            if track["segments"] is not None:
+                continue  # Transkript liegt schon aus dem Stream vor
+            if ffmpeg_available():
+                # Segmentweise und parallel, mit Zeitstempeln pro Segment
+                track["segments"] = transcribe_recording(track["path"])
+            else:
+                # Kein ffmpeg installiert -> ganze Aufnahme als ein Auftrag (alter Weg)
+                text = transcribe_audio_google(track["path"], AUDIO_BUCKET)
+                if text.startswith("Fehler"):
+                    raise RuntimeError(text)
+                track["segments"] = [[0.0, text]] if text != "Keine Sprache erkannt" else []
+            # Pro Spur merken, damit ein erneuter Versuch fertige Spuren nicht noch einmal transkribiert
+            set_stage("transcribing")
+
+        transcript = merge_tracks(job.tracks)
+        job.transcript = transcript
+        print(f"📝 Fertiges Transkript ({len(job.tracks)} Spuren): {len(transcript)} Zeichen")
+
+    if not transcript:
+        return NO_SPEECH_SUMMARY
+
+    set_stage("summarizing")
+    summary = summarize_with_gemini(transcript)
+    if summary.startswith("Fehler bei der Zusammenfassung"):
+        raise RuntimeError(summary)
+    print(f"📄 Zusammenfassung für Meeting {job.meeting_code} erstellt")
+    return summary
+
+
+def tracks_available(job: Job) -> bool:
+    """
+    Die Spurdateien liegen im lokalen AUDIO_SPOOL_DIR des aufnehmenden Workers. Ein anderer
+    Worker kann den Job nur übernehmen, wenn nichts mehr transkribiert werden muss oder
+    das Verzeichnis gemeinsam genutzt wird (z.B. Netzlaufwerk).
+    """
+    if job.transcript:
+        return True
+    return all(track["segments"] is not None or os.path.exists(track["path"]) for track in job.tracks or [])
+
+
+def finish_meeting_job(job: Job):
+    if job.status == DONE:
+        summary_store.save(job.meeting_code, READY, transcript=job.transcript, summary=job.result)
+        print(f"💾 Zusammenfassung für Meeting {job.meeting_code} gespeichert!")
+    else:
+        summary_store.save(job.meeting_code, FAILED, transcript=job.transcript)
+    # Wartende Clients (Long-Poll / SSE) auf allen Workern wecken
+    summary_notifier.notify_threadsafe(job.meeting_code, READY if job.status == DONE else FAILED)
+
+    # Aufräumen: Die Audiospuren gehören ab der Übergabe dem Job
+    for track in job.tracks or []:
+        remove_track_file(track["path"])
+
+
+async def submit_meeting_audio(meeting_code: str, tracks: list[dict]) -> Job:
+    """Legt den Eintrag in meeting_summaries als "processing" an und startet EINEN Job für alle Spuren."""
+    await asyncio.to_thread(summary_store.save, meeting_code, PROCESSING)
+    return await summary_queue.submit(meeting_code, tracks=tracks)
+
+
+summary_queue = JobQueue(
+    handler=process_meeting_audio,
+    backend=create_job_backend(JOB_BACKEND),
+    on_finished=finish_meeting_job,
+    runnable=tracks_available
+)
@@ -0,0 +1,178 @@
+# In backend/app/functions/presence.py
+#
+# Anwesenheit in Meetings, an einer Stelle statt verteilt über Router und Socket-Manager:
+#
+#   Teilnahmen: aktive Zeilen in meeting_participants (left_at IS NULL) pro Meeting im
+#               Speicher (user_id -> participant_id), beim ersten Zugriff einmal über den
+#               partiellen Index geladen. Die Datenbank bleibt maßgeblich: der Unique-Index
+#               verhindert doppelte aktive Teilnahmen auch bei parallelen Workern.
+#   Online:     wer gerade mit dem Signaling-WebSocket verbunden ist (liefert existing_users).
+#               Pro Verbindung geführt: Hat ein User mehrere Sockets (z.B. zweiter Tab oder
+#               Reconnect auf einem anderen Worker), bleibt er online, bis der letzte schließt.
+#
+# Änderungen werden über den Broker an alle Worker verteilt. Ein neu startender Worker
+# fordert mit "sync" die Online-Liste der anderen Worker an.
+
+import os
+import uuid
+from collections import OrderedDict
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from .broker import Broker, broker
+
+PRESENCE_CHANNEL = "presence"
+# Höchstens so viele Meetings im Teilnahme-Index; verdrängte werden bei Bedarf neu geladen
+PRESENCE_MAX_MEETINGS = int(os.getenv("PRESENCE_MAX_MEETINGS", "5000"))
+
+
+class PresenceService:
+    def __init__(self, broker: Broker, max_meetings: int = PRESENCE_MAX_MEETINGS):
+        self.broker = broker
+        self.worker_id = uuid.uuid4().hex
+        self.max_meetings = max_meetings
+        # meeting_id -> {user_id: participant_id}, LRU-begrenzt
+        self._participants: OrderedDict[int, dict[int, int]] = OrderedDict()
+        # meeting_code -> {user_id: {connection_id: worker_id}}
+        self._online: dict[str, dict[int, dict[str, str]]] = {}
+        broker.subscribe(PRESENCE_CHANNEL, self._on_broker_message)
+
+    async def start(self):
+        await self._publish("sync")
+
+    # --- Teilnahmen -------------------------------------------------------------------
+
+    async def _active(self, db: AsyncSession, meeting_id: int) -> dict[int, int]:
+        active = self._participants.get(meeting_id)
+        if active is not None:
+            self._participants.move_to_end(meeting_id)
+        else:
+            rows = await db.execute(
+                select(models.MeetingParticipant.user_id, models.MeetingParticipant.id).where(
+                    models.MeetingParticipant.meeting_id == meeting_id,
+                    models.MeetingParticipant.left_at.is_(None)
+                )
+            )
+            active = self._participants.setdefault(meeting_id, {})
+            active.update(dict(rows.all()))
+            while len(self._participants) > self.max_meetings:
+                self._participants.popitem(last=False)
+        return active
+
+    async def join(self, db: AsyncSession, meeting_id: int, user_id: int) -> models.MeetingParticipant | None:
+        """Legt eine neue aktive Teilnahme an. None, wenn der User bereits im Meeting ist."""
+        active = await self._active(db, meeting_id)
+        participant_id = active.get(user_id)
+        if participant_id is not None:
+            # Gegenprobe per Primärschlüssel, falls ein "left" eines anderen Workers fehlt
+            existing = await db.get(models.MeetingParticipant, participant_id)
+            if existing is not None and existing.left_at is None:
+                return None
+            active.pop(user_id, None)
+
+        participant = models.MeetingParticipant(user_id=user_id, meeting_id=meeting_id)
+        db.add(participant)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Gleichzeitig auf einem anderen Worker beigetreten; Index beim nächsten Zugriff neu laden
+            await db.rollback()
+            self._participants.pop(meeting_id, None)
+            return None
+        await db.refresh(participant)
+        await self._publish("joined", meeting_id=meeting_id, user_id=user_id, participant_id=participant.id)
+        return participant
+
+    async def leave(self, db: AsyncSession, meeting_id: int, user_id: int) -> models.MeetingParticipant | None:
+        """Beendet die aktive Teilnahme (setzt left_at). None, wenn der User nicht im Meeting ist."""
+        active = await self._active(db, meeting_id)
+        participant_id = active.get(user_id)
+        participant = await db.get(models.MeetingParticipant, participant_id) if participant_id else None
+        if participant is None or participant.left_at is not None:
+            # Speicherstand veraltet (z.B. "joined" eines anderen Workers verpasst): einmal nachsehen
+            participant = await db.scalar(select(models.MeetingParticipant).where(
+                models.MeetingParticipant.meeting_id == meeting_id,
+                models.MeetingParticipant.user_id == user_id,
+                models.MeetingParticipant.left_at.is_(None)
+            ))
+            if participant is None:
+                active.pop(user_id, None)
+                return None
+
+        participant.left_at = func.now()
+        await db.commit()
+        await db.refresh(participant)
+        await self._publish("left", meeting_id=meeting_id, user_id=user_id)
+        return participant
+
+    # --- Online (Signaling-WebSocket) -------------------------------------------------
+
+    def roster(self, meeting_code: str) -> list[int]:
+        return list(self._online.get(meeting_code, ()))
+
+    async def connect(self, meeting_code: str, user_id: int) -> tuple[str, list[int]]:
+        """
+        Meldet eine Verbindung des Users online. Liefert die ID der Verbindung (für
+        disconnect) und die bereits verbundenen Teilnehmer.
+        """
+        existing = [uid for uid in self.roster(meeting_code) if uid != user_id]
+        connection_id = uuid.uuid4().hex
+        await self._publish("online", meeting_code=meeting_code, user_id=user_id, connection_id=connection_id)
+        return connection_id, existing
+
+    async def disconnect(self, meeting_code: str, user_id: int, connection_id: str) -> bool:
+        """Meldet die Verbindung offline. True, wenn der User noch über eine andere verbunden ist."""
+        await self._publish("offline", meeting_code=meeting_code, user_id=user_id, connection_id=connection_id)
+        return user_id in self._online.get(meeting_code, {})
+
+    # --- Synchronisation --------------------------------------------------------------
+
+    async def _publish(self, kind: str, **fields):
+        event = {"type": kind, "worker_id": self.worker_id, **fields}
+        # Lokal sofort anwenden; das Echo über den Broker ist idempotent
+        self._apply(event)
+        await self.broker.publish(PRESENCE_CHANNEL, event)
+
+    async def _on_broker_message(self, event: dict):
+        if event["type"] == "sync":
+            if event["worker_id"] != self.worker_id:
+                for meeting_code, users in list(self._online.items()):
+                    for user_id, connections in list(users.items()):
+                        for connection_id, worker_id in list(connections.items()):
+                            if worker_id == self.worker_id:
+                                await self._publish("online", meeting_code=meeting_code,
+                                                    user_id=user_id, connection_id=connection_id)
+            return
+        self._apply(event)
+
+    def _apply(self, event: dict):
+        kind = event["type"]
+        if kind == "joined":
+            # Nur Meetings pflegen, die dieser Worker schon geladen hat
+            active = self._participants.get(event["meeting_id"])
+            if active is not None:
+                active[event["user_id"]] = event["participant_id"]
+        elif kind == "left":
+            active = self._participants.get(event["meeting_id"])
+            if active is not None:
+                active.pop(event["user_id"], None)
+                if not active:
+                    del self._participants[event["meeting_id"]]
+        elif kind == "online":
+            users = self._online.setdefault(event["meeting_code"], {})
+            users.setdefault(event["user_id"], {})[event["connection_id"]] = event["worker_id"]
+        elif kind == "offline":
+            users = self._online.get(event["meeting_code"])
+            connections = users.get(event["user_id"]) if users else None
+            if connections is not None:
+                connections.pop(event["connection_id"], None)
+                if not connections:
+                    del users[event["user_id"]]
+                    if not users:
+                        del self._online[event["meeting_code"]]
+
+
+presence = PresenceService(broker)
@@ -0,0 +1,114 @@
+# In backend/app/functions/sender.py
+#
+# Gepufferter Versand an einen einzelnen WebSocket: Jede Verbindung hat eine eigene,
+# begrenzte Warteschlange und einen eigenen Writer-Task. Ein Broadcast legt die
+# Nachricht nur in die Queues und wartet nie auf einen langsamen Empfänger.
+
+import asyncio
+import os
+import time
+
+from fastapi import WebSocket
+
+from . import metrics
+
+SEND_QUEUE_SIZE = int(os.getenv("MEETING_SEND_QUEUE_SIZE", "256"))
+
+# Verhalten bei voller Queue:
+#   drop        -> neue Nachricht verwerfen
+#   drop_oldest -> älteste wartende Nachricht verwerfen, neue behalten
+#   disconnect  -> Verbindung des langsamen Empfängers schließen
+SLOW_CONSUMER_POLICY = os.getenv("MEETING_SLOW_CONSUMER_POLICY", "disconnect")
+SLOW_CONSUMER_POLICIES = ("drop", "drop_oldest", "disconnect")
+
+# Optionales Bündeln: Frames, die innerhalb des Fensters anfallen (z.B. ICE-Kandidaten
+# während der Verhandlung), gehen als ein JSON-Array-Frame raus. Nur für Clients, die
+# das beim Verbindungsaufbau angefordert haben.
+BATCH_WINDOW = int(os.getenv("MEETING_BATCH_WINDOW_MS", "15")) / 1000
+BATCH_MAX_FRAMES = int(os.getenv("MEETING_BATCH_MAX_FRAMES", "64"))
+
+# WebSocket-Close-Code "Try Again Later"
+WS_1013_TRY_AGAIN_LATER = 1013
+
+
+class QueuedSender:
+    def __init__(self, websocket: WebSocket, metric_prefix: str,
+                 maxsize: int = SEND_QUEUE_SIZE, policy: str = SLOW_CONSUMER_POLICY,
+                 batch_window: float = 0):
+        if policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unbekannte Slow-Consumer-Policy: {policy}")
+        self.websocket = websocket
+        self.metric_prefix = metric_prefix
+        self.policy = policy
+        self.batch_window = batch_window  # 0 = jeder Frame einzeln
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.closed = False
+        self._task: asyncio.Task | None = None
+        self._disconnect_task: asyncio.Task | None = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._writer())
+
+    async def close(self):
+        self.closed = True
+        if self._task and self._task is not asyncio.current_task():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    def send(self, message: str):
+        """Reiht eine Nachricht ein, ohne zu warten. Bei voller Queue greift die Policy."""
+        if self.closed:
+            return
+        if self.queue.full():
+            metrics.increment(f"{self.metric_prefix}.slow_consumer_{self.policy}")
+            if self.policy == "drop":
+                return
+            if self.policy == "drop_oldest":
+                self.queue.get_nowait()
+            else:
+                self.closed = True
+                self._disconnect_task = asyncio.create_task(self._disconnect())
+                return
+        self.queue.put_nowait((time.perf_counter(), message))
+
+    async def _disconnect(self):
+        try:
+            await self.websocket.close(code=WS_1013_TRY_AGAIN_LATER, reason="Slow consumer")
+        except Exception:
+            pass
+        await self.close()
+
+    async def _writer(self):
+        while True:
+            batch = [await self.queue.get()]
+            if self.batch_window > 0:
+                await self._collect_batch(batch)
+            if len(batch) == 1:
+                frame = batch[0][1]
+            else:
+                # Die Nachrichten sind bereits kodiertes JSON; das Array entsteht ohne erneutes Kodieren
+                frame = "[" + ",".join(message for _, message in batch) + "]"
+                metrics.increment(f"{self.metric_prefix}.frames_coalesced", len(batch) - 1)
+            try:
+                await self.websocket.send_text(frame)
+            except Exception:
+                # Socket ist weg; das Aufräumen übernimmt der WebSocket-Endpunkt
+                self.closed = True
+                return
+            # Latenz von "eingereiht" bis "gesendet", inkl. Wartezeit in der Queue – pro Nachricht
+            sent_at = time.perf_counter()
+            for enqueued_at, _ in batch:
+                metrics.observe(f"{self.metric_prefix}.send_latency", sent_at - enqueued_at)
+
+    async def _collect_batch(self, batch: list):
+        # Fenster abwarten und dann nur synchron entnehmen: kein wait_for(queue.get()),
+        # das (vor Python 3.12) bei gleichzeitigem Timeout eine Nachricht verlieren kann
+        await asyncio.sleep(self.batch_window)
+        while len(batch) < BATCH_MAX_FRAMES and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
@@ -0,0 +1,209 @@
+# In backend/app/functions/stt.py
+#
+# Spracherkennung.
+#
+# Streaming: Der Audio-WebSocket reicht jeden Chunk direkt beim Empfang weiter und
+# bekommt laufend Teil-Transkripte zurück. Am Ende des Meetings liegt das Transkript
+# damit schon vor, statt erst hochgeladen und erkannt zu werden.
+#
+# Batch: Erkennt ein kurzes PCM-Segment (LINEAR16, mono) synchron; wird von
+# transcription.py für aufgeteilte lange Aufnahmen genutzt.
+#
+# STT_BACKEND:
+#   google -> Google*Recognizer (Standard)
+#   fake   -> Fake*Recognizer (deterministisch, für Tests)
+
+import asyncio
+import os
+import queue
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+from .clients import get_speech_client
+
+STT_BACKEND = os.getenv("STT_BACKEND", "google")
+STT_LANGUAGE = os.getenv("STT_LANGUAGE", "de-DE")
+STT_MODEL = os.getenv("STT_MODEL", "default")
+
+
+@dataclass
+class TranscriptUpdate:
+    text: str
+    is_final: bool
+
+
+class StreamingRecognizer(ABC):
+    """
+    Schnittstelle für einen Erkennungs-Stream pro Audio-Verbindung.
+
+    feed() nimmt Chunks entgegen, ohne zu blockieren; poll() liefert alle seit dem
+    letzten Aufruf neuen Teilergebnisse; finish() schließt den Stream ab und gibt das
+    finale Transkript zurück. `failed` ist gesetzt, wenn der Stream abgebrochen ist.
+    """
+
+    failed = False
+
+    @abstractmethod
+    def feed(self, chunk: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def poll(self) -> list[TranscriptUpdate]:
+        ...
+
+    @abstractmethod
+    async def finish(self) -> str:
+        ...
+
+
+class FakeStreamingRecognizer(StreamingRecognizer):
+    """
+    Deterministischer Recognizer für Tests: UTF-8-lesbare Chunks werden als gesprochener
+    Text interpretiert, alle anderen als Platzhalter "[chunk n: k bytes]".
+    """
+
+    def __init__(self):
+        self._segments: list[str] = []
+        self._pending: list[TranscriptUpdate] = []
+
+    def feed(self, chunk: bytes) -> None:
+        try:
+            text = chunk.decode("utf-8").strip()
+        except UnicodeDecodeError:
+            text = f"[chunk {len(self._segments) + 1}: {len(chunk)} bytes]"
+        if text:
+            self._segments.append(text)
+            self._pending.append(TranscriptUpdate(text=text, is_final=True))
+
+    def poll(self) -> list[TranscriptUpdate]:
+        updates, self._pending = self._pending, []
+        return updates
+
+    async def finish(self) -> str:
+        return " ".join(self._segments)
+
+
+class GoogleStreamingRecognizer(StreamingRecognizer):
+    """
+    Google Speech-to-Text streaming_recognize in einem Hintergrund-Thread.
+    Die Chunks (WebM/Opus vom MediaRecorder) werden 1:1 als Requests weitergereicht.
+
+    Hinweis: Google begrenzt einen Stream auf ca. 5 Minuten. Da nur der erste WebM-Chunk
+    den Container-Header enthält, kann der Stream nicht neu gestartet werden; bricht er ab,
+    ist `failed` gesetzt und der Aufrufer fällt auf die Batch-Transkription zurück.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._chunks: queue.Queue = queue.Queue()
+        self._updates: queue.Queue = queue.Queue()
+        self._final_segments: list[str] = []
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _requests(self):
+        from google.cloud import speech
+        while True:
+            chunk = self._chunks.get()
+            if chunk is None:
+                return
+            yield speech.StreamingRecognizeRequest(audio_content=chunk)
+
+    def _run(self):
+        from google.cloud import speech
+        config = speech.StreamingRecognitionConfig(
+            config=speech.RecognitionConfig(
+                encoding=speech.RecognitionConfig.AudioEncoding.WEBM_OPUS,
+                sample_rate_hertz=48000,
+                language_code=STT_LANGUAGE,
+                model=STT_MODEL,
+                enable_automatic_punctuation=True,
+            ),
+            interim_results=True,
+        )
+        try:
+            responses = self.client.streaming_recognize(config=config, requests=self._requests())
+            for response in responses:
+                for result in response.results:
+                    if not result.alternatives:
+                        continue
+                    text = result.alternatives[0].transcript.strip()
+                    if result.is_final:
+                        self._final_segments.append(text)
+                    self._updates.put(TranscriptUpdate(text=text, is_final=result.is_final))
+        except Exception as e:
+            print(f"Streaming-Transkription abgebrochen: {e}")
+            self.failed = True
+            # Restliche Chunks verwerfen, damit feed() nicht unbegrenzt puffert
+            while not self._chunks.empty():
+                self._chunks.get_nowait()
+
+    def feed(self, chunk: bytes) -> None:
+        if not self.failed:
+            self._chunks.put(chunk)
+
+    def poll(self) -> list[TranscriptUpdate]:
+        updates = []
+        while True:
+            try:
+                updates.append(self._updates.get_nowait())
+            except queue.Empty:
+                return updates
+
+    async def finish(self) -> str:
+        self._chunks.put(None)
+        await asyncio.to_thread(self._thread.join)
+        return " ".join(self._final_segments).strip()
+
+
+def create_streaming_recognizer() -> StreamingRecognizer:
+    if STT_BACKEND == "fake":
+        return FakeStreamingRecognizer()
+    if STT_BACKEND == "google":
+        return GoogleStreamingRecognizer(get_speech_client())
+    raise ValueError(f"Unbekanntes STT_BACKEND: {STT_BACKEND}")
+
+
+class BatchRecognizer(ABC):
+    """Schnittstelle für die Erkennung eines einzelnen, kurzen Segments (max. ~1 Minute)."""
+
+    @abstractmethod
+    def recognize(self, pcm: bytes, sample_rate: int) -> str:
+        ...
+
+
+class FakeBatchRecognizer(BatchRecognizer):
+    """Deterministisch für Tests: beschreibt nur die Länge des Segments."""
+
+    def recognize(self, pcm: bytes, sample_rate: int) -> str:
+        return f"[{len(pcm) / 2 / sample_rate:.1f}s Audio]"
+
+
+class GoogleBatchRecognizer(BatchRecognizer):
+    """Synchrones recognize() – ohne GCS-Upload, da jedes Segment unter dem 1-Minuten-Limit bleibt."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def recognize(self, pcm: bytes, sample_rate: int) -> str:
+        from google.cloud import speech
+        config = speech.RecognitionConfig(
+            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=sample_rate,
+            language_code=STT_LANGUAGE,
+            model=STT_MODEL,
+            enable_automatic_punctuation=True,
+        )
+        response = self.client.recognize(config=config, audio=speech.RecognitionAudio(content=pcm))
+        return " ".join(
+            result.alternatives[0].transcript for result in response.results if result.alternatives
+        ).strip()
+
+
+def create_batch_recognizer() -> BatchRecognizer:
+    if STT_BACKEND == "fake":
+        return FakeBatchRecognizer()
+    if STT_BACKEND == "google":
+        return GoogleBatchRecognizer(get_speech_client())
+    raise ValueError(f"Unbekanntes STT_BACKEND: {STT_BACKEND}")
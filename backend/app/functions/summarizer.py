@@ -0,0 +1,118 @@
+# In backend/app/functions/summarizer.py
+#
+# Hierarchische Zusammenfassung (Map-Reduce) für Transkripte, die nicht in einen
+# Prompt passen: Das Transkript wird nach Token-Budget in Abschnitte geteilt, die
+# Abschnitte werden parallel zu Notizen verdichtet (Map), die Notizen so lange
+# zusammengefasst, bis sie in einen Prompt passen (Reduce), und daraus entsteht die
+# finale Zusammenfassung mit Hauptthemen / Entscheidungen / To-Do-Punkten.
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .clients import get_llm_backend
+from .llm import LLMBackend
+
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "30000"))
+SUMMARY_WORKERS = int(os.getenv("SUMMARY_WORKERS", "4"))
+# Obergrenze für Reduce-Stufen; jede Stufe kostet LLM-Aufrufe
+SUMMARY_MAX_ROUNDS = int(os.getenv("SUMMARY_MAX_ROUNDS", "3"))
+CHARS_PER_TOKEN = 4  # grobe Schätzung, reicht für die Budget-Planung
+
+# Bei jeder inhaltlichen Änderung an den Prompts erhöhen (Teil des Cache-Schlüssels)
+PROMPT_VERSION = "1"
+
+_executor = ThreadPoolExecutor(max_workers=SUMMARY_WORKERS, thread_name_prefix="llm")
+
+FINAL_PROMPT = """
+Du bist ein professioneller KI-Assistent, der für die Zusammenfassung von Business-Meetings zuständig ist.
+
+Deine Aufgabe ist es, das folgende Meeting-{source} zu analysieren und eine präzise, gut strukturierte Zusammenfassung zu erstellen.
+
+Die Zusammenfassung muss folgende Abschnitte enthalten, wenn es relevant ist und sowas besprochen wurde:
+
+1.  **Hauptthemen:** Eine kurze Übersicht der besprochenen Themen.
+2.  **Wichtige Entscheidungen:** Eine klare Liste aller getroffenen Entscheidungen.
+3.  **To-Do-Punkte:** Eine Liste der vereinbarten Aufgaben (Action Items), idealerweise mit den verantwortlichen Personen, falls diese im Text genannt werden.
+
+Hier ist das {source}:
+---
+{text}
+---
+"""
+
+MAP_PROMPT = """
+Du verdichtest Abschnitt {index} von {total} eines Business-Meetings zu Notizen.
+
+Halte stichpunktartig fest: besprochene Themen, getroffene Entscheidungen und vereinbarte
+Aufgaben (mit verantwortlichen Personen, falls genannt). Nichts erfinden, nichts weglassen,
+was für eine spätere Gesamtzusammenfassung wichtig ist.
+
+Hier ist der Abschnitt:
+---
+{text}
+---
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def split_by_budget(text: str, max_tokens: int) -> list[str]:
+    """Teilt an Zeilengrenzen (Sprecherwechsel); zu lange Zeilen werden an Wortgrenzen geteilt."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    chunks, current, size = [], [], 0
+
+    def flush():
+        nonlocal current, size
+        if current:
+            chunks.append("\n".join(current))
+        current, size = [], 0
+
+    for line in text.splitlines():
+        while len(line) > max_chars:
+            cut = line.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            flush()
+            chunks.append(line[:cut])
+            line = line[cut:].lstrip()
+        if size + len(line) + 1 > max_chars:
+            flush()
+        current.append(line)
+        size += len(line) + 1
+    flush()
+    return chunks
+
+
+def summarize_transcript(transcript: str, backend: LLMBackend | None = None,
+                         chunk_tokens: int = SUMMARY_CHUNK_TOKENS) -> str:
+    backend = backend or get_llm_backend()
+    # Reservierter Platz für den Prompt-Text selbst
+    budget = chunk_tokens - estimate_tokens(MAP_PROMPT)
+    if budget <= 0:
+        raise ValueError(f"SUMMARY_CHUNK_TOKENS={chunk_tokens} ist kleiner als der Prompt selbst")
+    text, source = transcript, "Transkript"
+
+    # Reduce-Stufen, bis der Text in einen einzigen Prompt passt
+    for _ in range(SUMMARY_MAX_ROUNDS):
+        tokens = estimate_tokens(text)
+        if tokens <= budget:
+            break
+        chunks = split_by_budget(text, budget)
+        print(f"🧩 Zusammenfassung in {len(chunks)} Abschnitten ({source})")
+        prompts = [
+            MAP_PROMPT.format(index=i, total=len(chunks), text=chunk)
+            for i, chunk in enumerate(chunks, start=1)
+        ]
+        notes = list(_executor.map(backend.generate, prompts))  # Reihenfolge bleibt erhalten
+        text = "\n\n".join(f"Abschnitt {i}:\n{note.strip()}" for i, note in enumerate(notes, start=1))
+        source = "Notizen (abschnittsweise)"
+        if estimate_tokens(text) >= tokens:
+            # Die Notizen sind nicht kürzer geworden; weitere Runden würden nur Kosten erzeugen
+            break
+
+    if estimate_tokens(text) > budget:
+        print(f"⚠️ Notizen passen nach der Verdichtung nicht in einen Prompt, werden gekürzt ({source})")
+        text = text[:budget * CHARS_PER_TOKEN]
+
+    return backend.generate(FINAL_PROMPT.format(source=source, text=text))
@@ -0,0 +1,56 @@
+# In backend/app/functions/summary_events.py
+#
+# Benachrichtigt wartende Clients, sobald die Zusammenfassung eines Meetings fertig ist.
+# Die Benachrichtigung läuft über den Broker, damit auch Clients auf anderen Workern
+# (Long-Poll oder Server-Sent Events) sofort geweckt werden.
+
+import asyncio
+
+from .broker import Broker, broker
+
+SUMMARY_CHANNEL = "summary"
+
+
+class SummaryNotifier:
+    def __init__(self, broker: Broker):
+        self.broker = broker
+        self._waiters: dict[str, set[asyncio.Future]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        broker.subscribe(SUMMARY_CHANNEL, self._on_broker_message)
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop):
+        """Event-Loop merken, damit die Job-Threads threadsicher veröffentlichen können."""
+        self._loop = loop
+
+    def listen(self, meeting_code: str) -> asyncio.Future:
+        """
+        Registriert einen Wartenden. Erst registrieren, dann den Status prüfen – so geht
+        keine Benachrichtigung zwischen Prüfung und Warten verloren.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(meeting_code, set()).add(future)
+        return future
+
+    def unlisten(self, meeting_code: str, future: asyncio.Future):
+        waiters = self._waiters.get(meeting_code)
+        if waiters:
+            waiters.discard(future)
+            if not waiters:
+                del self._waiters[meeting_code]
+
+    def notify_threadsafe(self, meeting_code: str, status: str):
+        """Aus einem Job-Thread aufrufbar."""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(
+            self.broker.publish(SUMMARY_CHANNEL, {"meeting_code": meeting_code, "status": status}),
+            self._loop
+        )
+
+    async def _on_broker_message(self, envelope: dict):
+        for future in self._waiters.pop(envelope["meeting_code"], ()):
+            if not future.done():
+                future.set_result(envelope["status"])
+
+
+summary_notifier = SummaryNotifier(broker)
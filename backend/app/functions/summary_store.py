@@ -0,0 +1,112 @@
+# In backend/app/functions/summary_store.py
+#
+# Dauerhafter Speicher für Meeting-Zusammenfassungen (Tabelle meeting_summaries) mit
+# einem begrenzten LRU-Cache davor. Fertige Zusammenfassungen ändern sich selten,
+# deshalb kann das Polling sie nach dem ersten Treffer direkt aus dem Cache bedienen.
+# Jede Änderung (z.B. neue Aufnahme desselben Meetings) verwirft den Eintrag über den
+# Broker auf allen Workern.
+
+import asyncio
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from .. import database, models
+from .broker import Broker, broker
+
+SUMMARY_CACHE_SIZE = int(os.getenv("SUMMARY_CACHE_SIZE", "256"))
+
+# Broker-Kanal für die Invalidierung des Caches
+SUMMARY_STORE_CHANNEL = "summary_store"
+
+# Status einer Zusammenfassung
+PROCESSING = "processing"
+READY = "ready"
+FAILED = "failed"
+
+
+class SummaryStore:
+    def __init__(self, broker: Broker, max_entries: int = SUMMARY_CACHE_SIZE):
+        self.broker = broker
+        self.max_entries = max_entries
+        self.store_id = uuid.uuid4().hex
+        self._cache: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        broker.subscribe(SUMMARY_STORE_CHANNEL, self._on_broker_message)
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop):
+        """Event-Loop merken: save() läuft in Threads und veröffentlicht threadsicher."""
+        self._loop = loop
+
+    def get(self, meeting_code: str) -> dict | None:
+        """Liefert {"status", "summary"} oder None, wenn es für das Meeting noch nichts gibt."""
+        with self._lock:
+            entry = self._cache.get(meeting_code)
+            if entry is not None:
+                self._cache.move_to_end(meeting_code)
+                return entry
+
+        with database.SessionLocal() as db:
+            row = db.query(models.MeetingSummary).filter(
+                models.MeetingSummary.meeting_code == meeting_code
+            ).first()
+            if row is None:
+                return None
+            entry = {"status": row.status, "summary": row.summary}
+
+        self._remember(meeting_code, entry)
+        return entry
+
+    def save(self, meeting_code: str, status: str, transcript: str | None = None,
+             summary: str | None = None):
+        # Upsert in einer Anweisung: zwei gleichzeitige Pipeline-Läufe für dasselbe Meeting
+        # kollidieren nicht am Unique-Index auf meeting_code
+        values = {"meeting_code": meeting_code, "status": status, "updated_at": datetime.utcnow()}
+        if transcript is not None:
+            values["transcript"] = transcript
+        if summary is not None:
+            values["summary"] = summary
+
+        with database.SessionLocal() as db:
+            dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+            stmt = dialect.insert(models.MeetingSummary).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[models.MeetingSummary.meeting_code],
+                set_={key: stmt.excluded[key] for key in values if key != "meeting_code"}
+            ).returning(models.MeetingSummary.status, models.MeetingSummary.summary)
+            row = db.execute(stmt).one()
+            db.commit()
+            entry = {"status": row.status, "summary": row.summary}
+
+        self._remember(meeting_code, entry)
+        # Andere Worker haben evtl. noch den alten Stand im Cache
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(
+                self.broker.publish(SUMMARY_STORE_CHANNEL, {"meeting_code": meeting_code, "origin": self.store_id}),
+                self._loop
+            )
+
+    def _remember(self, meeting_code: str, entry: dict):
+        # Nur abgeschlossene Einträge cachen; "processing" kann ein anderer Worker jederzeit ändern
+        with self._lock:
+            if entry["status"] == PROCESSING:
+                self._cache.pop(meeting_code, None)
+                return
+            self._cache[meeting_code] = entry
+            self._cache.move_to_end(meeting_code)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    async def _on_broker_message(self, envelope: dict):
+        if envelope.get("origin") == self.store_id:
+            return
+        with self._lock:
+            self._cache.pop(envelope["meeting_code"], None)
+
+
+summary_store = SummaryStore(broker)
@@ -0,0 +1,115 @@
+# In backend/app/functions/transcription.py
+#
+# Transkription langer Aufnahmen in Segmenten: Die Aufnahme wird an Sprechpausen
+# (bzw. spätestens nach TRANSCRIBE_SEGMENT_MAX_S Sekunden) geschnitten, die Segmente
+# werden parallel in einem begrenzten Thread-Pool erkannt und in der richtigen
+# Reihenfolge mit ihrem Start-Offset wieder zusammengesetzt.
+#
+# Zum Dekodieren und für die Pausen-Erkennung wird ffmpeg benötigt (AUDIO_FFMPEG).
+
+import os
+import re
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from .ai_cache import ai_cache, hash_file, hash_text
+from .stt import STT_LANGUAGE, STT_MODEL, BatchRecognizer, create_batch_recognizer
+
+FFMPEG = os.getenv("AUDIO_FFMPEG", "ffmpeg")
+SAMPLE_RATE = 16000
+SEGMENT_MAX_S = float(os.getenv("TRANSCRIBE_SEGMENT_MAX_S", "50"))   # synchrones recognize(): max. 60s
+SEGMENT_MIN_S = float(os.getenv("TRANSCRIBE_SEGMENT_MIN_S", "15"))
+SILENCE_NOISE = os.getenv("TRANSCRIBE_SILENCE_NOISE", "-35dB")
+SILENCE_MIN_S = float(os.getenv("TRANSCRIBE_SILENCE_MIN_S", "0.4"))
+TRANSCRIBE_WORKERS = int(os.getenv("TRANSCRIBE_WORKERS", "4"))
+
+_SILENCE_START = re.compile(r"silence_start: (-?[\d.]+)")
+_SILENCE_END = re.compile(r"silence_end: ([\d.]+)")
+_TIME = re.compile(r"time=(\d+):(\d+):([\d.]+)")
+
+# Ein gemeinsamer Pool begrenzt die parallelen STT-Anfragen über alle Jobs hinweg
+_executor = ThreadPoolExecutor(max_workers=TRANSCRIBE_WORKERS, thread_name_prefix="stt")
+
+
+def ffmpeg_available() -> bool:
+    return shutil.which(FFMPEG) is not None
+
+
+def analyze_recording(path: str) -> tuple[float, list[tuple[float, float]]]:
+    """Gibt (Dauer in Sekunden, Liste der Pausen als (start, ende)) zurück."""
+    result = subprocess.run(
+        [FFMPEG, "-nostdin", "-i", path, "-af",
+         f"silencedetect=noise={SILENCE_NOISE}:d={SILENCE_MIN_S}", "-f", "null", "-"],
+        capture_output=True, text=True, check=True
+    )
+    log = result.stderr
+    starts = [float(value) for value in _SILENCE_START.findall(log)]
+    ends = [float(value) for value in _SILENCE_END.findall(log)]
+    times = _TIME.findall(log)
+    duration = 0.0
+    if times:
+        hours, minutes, seconds = times[-1]
+        duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    return duration, list(zip(starts, ends))
+
+
+def plan_segments(duration: float, silences: list[tuple[float, float]],
+                  max_len: float = SEGMENT_MAX_S, min_len: float = SEGMENT_MIN_S) -> list[tuple[float, float]]:
+    """
+    Schneidet möglichst in der Mitte einer Pause, sodass jedes Segment zwischen
+    min_len und max_len lang ist. Ohne passende Pause wird hart bei max_len geschnitten.
+    """
+    cuts = [(start + end) / 2 for start, end in silences]
+    segments = []
+    start = 0.0
+    while duration - start > max_len:
+        window = [cut for cut in cuts if start + min_len <= cut <= start + max_len]
+        cut = window[-1] if window else start + max_len
+        segments.append((start, cut))
+        start = cut
+    if duration - start > 0:
+        segments.append((start, duration))
+    return segments
+
+
+def decode_segment(path: str, start: float, end: float) -> bytes:
+    """
+    Dekodiert einen Ausschnitt als 16 kHz mono LINEAR16. -ss vor -i sucht im Eingang:
+    ffmpeg springt zum Startpunkt statt die Datei bis dorthin zu dekodieren, jedes Segment
+    kostet damit nur seine eigene Länge.
+    """
+    result = subprocess.run(
+        [FFMPEG, "-nostdin", "-loglevel", "error", "-ss", f"{start:.3f}", "-i", path, "-t", f"{end - start:.3f}",
+         "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "-"],
+        capture_output=True, check=True
+    )
+    return result.stdout
+
+
+def transcribe_recording(path: str, recognizer: BatchRecognizer | None = None) -> list[list]:
+    """
+    Transkribiert eine Aufnahme segmentweise und parallel.
+    Rückgabe: [[start_offset_sekunden, text], ...] in zeitlicher Reihenfolge.
+    """
+    recognizer = recognizer or create_batch_recognizer()
+
+    # Gleiche Aufnahme schon transkribiert (Retry, Reconnect) -> Segmente aus dem Cache.
+    # Der Recognizer gehört zum Schlüssel: Fake-Ergebnisse dürfen nie als echte Transkripte gelten.
+    cache_key = hash_text(hash_file(path), type(recognizer).__name__, STT_LANGUAGE, STT_MODEL, str(SAMPLE_RATE))
+    cached = ai_cache.get("segments", cache_key)
+    if cached is not None:
+        return cached
+
+    duration, silences = analyze_recording(path)
+    segments = plan_segments(duration, silences)
+    print(f"🎧 {path}: {duration:.1f}s in {len(segments)} Segmente aufgeteilt")
+
+    def transcribe_segment(segment: tuple[float, float]) -> str:
+        return recognizer.recognize(decode_segment(path, *segment), SAMPLE_RATE)
+
+    # map() liefert die Ergebnisse in der Reihenfolge der Segmente, egal welches zuerst fertig ist
+    texts = _executor.map(transcribe_segment, segments)
+    result = [[round(start, 2), text] for (start, _), text in zip(segments, texts) if text]
+    ai_cache.set("segments", cache_key, result)
+    return result
@@ -7,11 +7,38 @@ dotenv_path = Path(__file__).parent / ".." / ".env"
 load_dotenv(dotenv_path=dotenv_path)
 # --------------------------------------------------------------------------------
 
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import authentication, user, chat, meeting
+from .routers import authentication, user, chat, meeting, metrics
+from .functions.chat_writer import chat_writer
+from .functions.broker import broker
+from .functions.pipeline import summary_queue
+from .functions.summary_events import summary_notifier
+from .functions.summary_store import summary_store
+from .functions.presence import presence
+from .verifications.mail_queue import mail_queue
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Hintergrund-Dienste starten und beim Herunterfahren sauber beenden
+    summary_notifier.bind_loop(asyncio.get_running_loop())
+    summary_store.bind_loop(asyncio.get_running_loop())
+    await broker.start()
+    await presence.start()  # Online-Liste der anderen Worker anfordern
+    await chat_writer.start()
+    await summary_queue.start()
+    await mail_queue.start()
+    yield
+    await mail_queue.stop()  # verschickt noch wartende Mails
+    await summary_queue.stop()
+    await chat_writer.stop()  # schreibt noch wartende Chat-Nachrichten weg
+    await broker.stop()
+
  
-app = FastAPI(title="AI-Meeting Backend")
+app = FastAPI(title="AI-Meeting Backend", lifespan=lifespan)
 
 # CORS-Middleware hinzufügen für Frontend-Kommunikation
 app.add_middleware(
@@ -27,3 +54,4 @@ app.include_router(authentication.router)
 app.include_router(user.router)
 app.include_router(chat.router) 
 app.include_router(meeting.router) 
+app.include_router(metrics.router)
@@ -1,5 +1,5 @@
 from .database import Base
-from sqlalchemy import TIMESTAMP, Column, Integer, String, Boolean, DateTime, ForeignKey, func
+from sqlalchemy import JSON, TIMESTAMP, Column, Index, Integer, String, Boolean, DateTime, ForeignKey, Text, func
 from datetime import datetime
 from pydantic_settings import BaseSettings
 
@@ -31,6 +31,17 @@ class Friend(Base):
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
 
 
+# Materialisierter Zähler pro Unterhaltung: wird beim Speichern einer Nachricht erhöht
+# und beim Lesen zurückgesetzt, damit /user/get_contacts keine Nachrichten zählen muss.
+class ConversationState(Base):
+    __tablename__ = 'conversation_state'
+
+    user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)      # Empfänger / Besitzer
+    contact_id = Column(Integer, ForeignKey('users.id'), primary_key=True)   # Absender / Kontakt
+    unread_count = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
 class ChatMessage(Base):
     __tablename__ = 'chat_messages'
     
@@ -40,6 +51,14 @@ class ChatMessage(Base):
     message = Column(String(1000), nullable=False)
     timestamp = Column(TIMESTAMP(timezone=True), nullable=False, default=func.now())
 
+    # Zusammengesetzter Index für die Chat-Historie: Jede Richtung einer Unterhaltung
+    # ist damit ein einziger sortierter Bereichs-Scan über (timestamp, id).
+    __table_args__ = (
+        Index('ix_chat_messages_conversation', 'sender_id', 'receiver_id', 'timestamp', 'id'),
+        # Für die ungelesenen Nachrichten in /user/get_contacts (alle Absender an einen Empfänger)
+        Index('ix_chat_messages_unread', 'receiver_id', 'sender_id', 'timestamp'),
+    )
+
 class Meeting(Base):
     __tablename__ = 'meetings'
     
@@ -56,4 +75,65 @@ class MeetingParticipant(Base):
     meeting_id = Column(Integer, ForeignKey('meetings.id'), nullable=False)  # Integer statt String!
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     joined_at = Column(DateTime, default=func.now(), nullable=False)
-    left_at = Column(DateTime, nullable=True)  # NULL = noch im Meeting
\ No newline at end of file
+    left_at = Column(DateTime, nullable=True)  # NULL = noch im Meeting
+
+    __table_args__ = (
+        # Partieller Index nur über aktive Teilnahmen; unique = höchstens eine aktive pro User und Meeting
+        Index('ix_meeting_participants_active', 'meeting_id', 'user_id', unique=True,
+              postgresql_where=left_at.is_(None), sqlite_where=left_at.is_(None)),
+    )
+
+# Zustand der Hintergrund-Jobs (Transkription + Zusammenfassung), siehe functions/jobs.py
+class PipelineJob(Base):
+    __tablename__ = 'pipeline_jobs'
+
+    id = Column(String(36), primary_key=True)
+    meeting_code = Column(String(10), nullable=False)
+    status = Column(String(20), nullable=False, index=True)
+    stage = Column(String(30), nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    error = Column(Text, nullable=True)
+    tracks = Column(JSON, nullable=True)
+    transcript = Column(Text, nullable=True)
+    result = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('ix_pipeline_jobs_meeting', 'meeting_code', 'created_at'),
+    )
+
+
+# Fertige (oder laufende) Zusammenfassung pro Meeting, siehe functions/summary_store.py
+class MeetingSummary(Base):
+    __tablename__ = 'meeting_summaries'
+
+    id = Column(Integer, primary_key=True, index=True)
+    meeting_code = Column(String(10), unique=True, nullable=False, index=True)
+    status = Column(String(20), nullable=False)
+    transcript = Column(Text, nullable=True)
+    summary = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+# Laufende Aufnahme eines Meetings über alle Worker: Zahl der offenen Audiospuren.
+# Wer die letzte Spur schließt, startet den Job (siehe functions/audio_ingest.py).
+class MeetingRecording(Base):
+    __tablename__ = 'meeting_recordings'
+
+    meeting_code = Column(String(10), primary_key=True)
+    id = Column(String(32), nullable=False, unique=True)
+    open_tracks = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+# Geschlossene Spuren einer laufenden Aufnahme (AudioTrack.to_dict)
+class RecordingTrack(Base):
+    __tablename__ = 'recording_tracks'
+
+    id = Column(Integer, primary_key=True)
+    recording_id = Column(String(32), nullable=False, index=True)
+    meeting_code = Column(String(10), nullable=False)
+    track = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
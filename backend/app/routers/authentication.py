@@ -1,33 +1,31 @@
 from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import RedirectResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext 
 from ..functions.function import create_token_expiry_time, create_verification_token, create_access_token
 from .. import models, schemas
-from ..database import get_db
+from ..database import get_db, get_async_db
 from ..verifications.email import send_verification_email
+from ..functions.auth_cache import principal_cache
+from ..functions import password
 
 router = APIRouter(
     prefix="/auth",
     tags=["Authentication"]
 )
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 @router.post("/register", response_model=schemas.ReturnUserSchema, status_code=status.HTTP_201_CREATED)
-async def register(user: schemas.CreateUserSchema, db: Session = Depends(get_db)):
+async def register(user: schemas.CreateUserSchema, db: AsyncSession = Depends(get_async_db)):
     try:
         # Überprüfen, ob die E-Mail bereits existiert
-        db_user = db.query(models.User).filter(models.User.email == user.email).first()
+        db_user = await db.scalar(select(models.User).where(models.User.email == user.email))
         if db_user:
             raise HTTPException(status_code=400, detail="E-Mail bereits registriert")
 
-        # Passwort hashen (bcrypt hat ein 72-Byte-Limit)
-        password_to_hash = user.password
-        if len(password_to_hash.encode('utf-8')) > 72:
-            password_to_hash = password_to_hash[:72]
-        hashed_password = pwd_context.hash(password_to_hash)
+        # Passwort hashen (bcrypt läuft im eigenen Thread-Pool, nicht im Event-Loop)
+        hashed_password = await password.hash_password(user.password)
 
         # Verification Token und Ablaufzeit generieren
         verification_token = create_verification_token()
@@ -45,22 +43,19 @@ async def register(user: schemas.CreateUserSchema, db: Session = Depends(get_db)
             created_at=datetime.utcnow()
         )
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
+        await db.refresh(new_user)
         
-        # Verification-Email senden
-        try:
-            await send_verification_email(
-                email_to=user.email,
-                token=verification_token
-            )
-            print(f"Verification-Email erfolgreich an {user.email} gesendet")
-        except Exception as e:
-            print(f"Warnung: Email konnte nicht an {user.email} gesendet werden: {e}")
+        # Verification-Email einreihen; der Versand blockiert die Registrierung nicht
+        if not send_verification_email(email_to=user.email, token=verification_token):
+            print(f"Warnung: Email an {user.email} konnte nicht eingereiht werden (Mail-Queue voll)")
             # Fortsetzung der Registrierung auch bei Email-Fehler
         
         return new_user
-        
+
+    except HTTPException:
+        # Fachliche Fehler (E-Mail vergeben, Server ausgelastet) unverändert weitergeben
+        raise
     except Exception as e:
         import traceback
         print(f"Registrierungsfehler: {e}")
@@ -84,17 +79,18 @@ def verify_email(token: str, db: Session = Depends(get_db)):
     user.verification_token = None
     user.verification_token_expires = None
     db.commit()
+    principal_cache.invalidate_user(user.id)
 
     success_url = "http://localhost:5173/email-verified"
     return RedirectResponse(url=success_url)
 
 @router.post("/login")
-def login(user: schemas.LoginUserSchema, db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter(models.User.email == user.email).first()
+async def login(user: schemas.LoginUserSchema, db: AsyncSession = Depends(get_async_db)):
+    db_user = await db.scalar(select(models.User).where(models.User.email == user.email))
     if not db_user:
         raise HTTPException(status_code=400, detail="Ungültige Anmeldedaten")
     
-    if not pwd_context.verify(user.password, db_user.password_hash):
+    if not await password.verify_password(user.password, db_user.password_hash):
         raise HTTPException(status_code=400, detail="Ungültige Anmeldedaten")
     
     if not db_user.is_verified:
@@ -1,29 +1,75 @@
 
 
-import json
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from sqlalchemy import func, tuple_
 from sqlalchemy.orm import Session
 from .. import models, database
 from ..functions.function import get_current_user, get_current_user_ws
+from ..functions.chat_writer import InvalidChatMessage, chat_writer
+from ..functions.broker import Broker, broker
+from ..functions import codec
 from .. import schemas
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+# Seitengröße der Chat-Historie (Standard und Obergrenze)
+CHAT_PAGE_SIZE = 50
+CHAT_PAGE_SIZE_MAX = 200
+
+# Broker-Kanal für die Zustellung von Chat-Nachrichten
+CHAT_CHANNEL = "chat"
+
 @router.get("/get_chat", response_model=list[schemas.GetChatMessage])
 def get_chat_messages(
     friend_id: int,
+    before_id: int | None = None,
+    after_id: int | None = None,
+    limit: int = Query(CHAT_PAGE_SIZE, ge=1, le=CHAT_PAGE_SIZE_MAX),
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    """Ruft alle Chat-Nachrichten zwischen dem eingeloggten Benutzer und einem Freund ab."""
-    messages = db.query(models.ChatMessage).filter(
+    """
+    Ruft eine Seite der Chat-Nachrichten zwischen dem eingeloggten Benutzer und einem Freund ab.
+
+    Ohne Cursor werden die neuesten `limit` Nachrichten geliefert. Mit `before_id` die
+    Nachrichten vor dieser Nachricht (ältere Seite), mit `after_id` die danach (neuere Seite).
+    Die Reihenfolge ist immer chronologisch nach (timestamp, id).
+    """
+    if before_id is not None and after_id is not None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Use either before_id or after_id, not both")
+
+    conversation = db.query(models.ChatMessage).filter(
         ((models.ChatMessage.sender_id == current_user.id) & (models.ChatMessage.receiver_id == friend_id)) |
-        ((models.ChatMessage.sender_id == friend_id) & (models.ChatMessage.receiver_id == current_user.id)),
-        models.ChatMessage.timestamp.isnot(None)
-    ).order_by(models.ChatMessage.timestamp).all()
-    return messages
+        ((models.ChatMessage.sender_id == friend_id) & (models.ChatMessage.receiver_id == current_user.id))
+    )
+    sort_key = tuple_(models.ChatMessage.timestamp, models.ChatMessage.id)
+
+    cursor_id = before_id if before_id is not None else after_id
+    if cursor_id is None:
+        # Neueste Seite: absteigend lesen, damit nur `limit` Zeilen aus dem Index kommen
+        page = conversation.order_by(
+            models.ChatMessage.timestamp.desc(), models.ChatMessage.id.desc()
+        ).limit(limit).all()
+        return list(reversed(page))
+
+    cursor = conversation.filter(models.ChatMessage.id == cursor_id).first()
+    if not cursor:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cursor message not found")
+
+    if before_id is not None:
+        page = conversation.filter(
+            sort_key < tuple_(cursor.timestamp, cursor.id)
+        ).order_by(
+            models.ChatMessage.timestamp.desc(), models.ChatMessage.id.desc()
+        ).limit(limit).all()
+        return list(reversed(page))
+
+    return conversation.filter(
+        sort_key > tuple_(cursor.timestamp, cursor.id)
+    ).order_by(
+        models.ChatMessage.timestamp, models.ChatMessage.id
+    ).limit(limit).all()
 
 
 @router.post("/{contact}/read", status_code=status.HTTP_204_NO_CONTENT)
@@ -42,12 +88,23 @@ def mark_messages_as_read(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Friendship not found")
 
     friendship.timestamp = func.now()
+    db.query(models.ConversationState).filter(
+        models.ConversationState.user_id == current_user.id,
+        models.ConversationState.contact_id == contact
+    ).update({models.ConversationState.unread_count: 0}, synchronize_session=False)
     db.commit()
     return {"detail": "Messages marked as read."}
 
 class ConnectionManager:
-    def __init__(self):
+    """
+    Verwaltet die lokal verbundenen Chat-Sockets. Zugestellt wird über den Broker,
+    damit auch Benutzer auf anderen Workern ihre Nachrichten erhalten.
+    """
+
+    def __init__(self, broker: Broker):
         self.active_connections: dict[int, List[WebSocket]] = {}
+        self.broker = broker
+        broker.subscribe(CHAT_CHANNEL, self._on_broker_message)
 
     async def connect(self, websocket: WebSocket, user_id: int):
         await websocket.accept()
@@ -62,17 +119,20 @@ class ConnectionManager:
                 del self.active_connections[user_id]
 
     async def send_personal_message(self, message: str, user_id: int):
-        websockets = self.active_connections.get(user_id)
+        await self.broker.publish(CHAT_CHANNEL, {"user_id": user_id, "message": message})
+
+    async def _on_broker_message(self, envelope: dict):
+        # Jeder Worker bekommt alle Nachrichten, zustellen kann nur der mit dem Socket
+        websockets = self.active_connections.get(envelope["user_id"])
         if websockets:
-            for websocket in websockets:
-                await websocket.send_text(message)
+            for websocket in list(websockets):
+                await websocket.send_text(envelope["message"])
             
-manager = ConnectionManager()
+manager = ConnectionManager(broker)
 
 @router.websocket("/ws")
 async def websocket_endpoint(
     websocket: WebSocket,
-    db: Session = Depends(database.get_db),
     # 1. Authentifizierung: Sicher und sauber über Depends
     #    Liest den Token aus dem Query-Parameter "?token=..."
     current_user: models.User = Depends(get_current_user_ws)
@@ -85,21 +145,25 @@ async def websocket_endpoint(
             data = await websocket.receive_text()
             
             # 2. Nachrichtenformat: Robust dank JSON
-            payload = json.loads(data)
-            
-            # Speichere die Nachricht in der Datenbank
-            new_message = models.ChatMessage(
-                sender_id=user_id,
-                receiver_id=payload['receiver_id'],
-                message=payload['message'],
-                timestamp=func.now()
-            )
-            db.add(new_message)
-            db.commit()
-            db.refresh(new_message)
-
-            response_message = schemas.GetChatMessage.model_validate(new_message)
-            response_json = response_message.model_dump_json()
+            try:
+                payload = codec.loads(data)
+                # Nachricht zum Speichern einreihen (Write-Behind): ID und Zeitstempel stehen sofort fest,
+                # der Hintergrund-Writer schreibt gesammelt inkl. Ungelesen-Zähler in die Datenbank.
+                new_message = await chat_writer.submit(
+                    sender_id=user_id,
+                    receiver_id=payload['receiver_id'],
+                    message=payload['message']
+                )
+            except InvalidChatMessage as e:
+                await websocket.send_text(codec.dumps({"type": "error", "reason": str(e)}))
+                continue
+            except (ValueError, KeyError, TypeError):
+                await websocket.send_text(codec.dumps({"type": "error", "reason": "invalid_payload"}))
+                continue
+
+            # Der Writer liefert bereits ein vollständiges GetChatMessage-Dict:
+            # einmal kodieren, ohne erneute Pydantic-Validierung
+            response_json = codec.dumps(new_message)
 
             # Sende an Empfänger und Sender
             await manager.send_personal_message(response_json, payload['receiver_id'])
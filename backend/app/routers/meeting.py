@@ -1,19 +1,41 @@
-import json
+import asyncio
 import hashlib
-import os
-from fastapi import Depends, WebSocket, WebSocketDisconnect
+import hmac
+from fastapi import Depends, Query, WebSocket, WebSocketDisconnect, WebSocketException
 from rich import _console
-from sqlalchemy import JSON, func
+from sqlalchemy import JSON, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import database, schemas, models
 from sqlalchemy.orm import Session
-from ..functions.function import get_current_user, generate_unique_meeting_code, get_current_user_ws, transcribe_audio_google, summarize_with_gemini
+from ..functions.function import get_current_user, get_current_user_ws
+from ..functions.meeting_codes import meeting_codes
+from ..functions.broker import Broker, broker
+from ..functions.sender import BATCH_WINDOW, QueuedSender
+from ..functions.stt import create_streaming_recognizer
+from ..functions.pipeline import submit_meeting_audio, summary_queue
+from ..functions.audio_ingest import audio_ingest
+from ..functions.summary_store import READY, summary_store
+from ..functions.jobs import FAILED
+from ..functions.summary_events import summary_notifier
+from ..functions.presence import presence
+from ..functions.meeting_cache import MeetingInfo, meeting_cache
+from fastapi.responses import StreamingResponse
+from ..functions import codec, metrics
 from fastapi import APIRouter, status, HTTPException
 router = APIRouter(
     prefix="/meeting",
     tags=["Meeting"]
 )
 
+# Long-Poll / SSE für die Zusammenfassung (Sekunden)
+SUMMARY_MAX_WAIT = 60
+SSE_KEEPALIVE = 15
+
+# Kollisionen gibt es nur mit Codes von vor dem Allocator, siehe meeting_codes.py
+MEETING_CODE_ATTEMPTS = 5
+
 def hash_password(password: str) -> str:
     # Gleiche Hash-Funktion wie beim Erstellen
     return hashlib.sha256(password.encode()).hexdigest()
@@ -21,246 +43,346 @@ def hash_password(password: str) -> str:
 @router.post("/create", response_model=schemas.ReturnMeetingSchema, status_code=status.HTTP_201_CREATED)
 async def create_meeting(
     meeting_data: schemas.CreateMeetingSchema,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     current_user: models.User = Depends(get_current_user)
 ):
     if not current_user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized") 
     
-    new_meeting = models.Meeting(
-        host_id=current_user.id,
-        meeting_name=meeting_data.meeting_name,
-        password=hash_password(meeting_data.password),  # Passwort hashen
-        meeting_code=generate_unique_meeting_code(db)
-    )
+    password_hash = hash_password(meeting_data.password)  # Passwort hashen
+    for _ in range(MEETING_CODE_ATTEMPTS):
+        new_meeting = models.Meeting(
+            host_id=current_user.id,
+            meeting_name=meeting_data.meeting_name,
+            password=password_hash,
+            meeting_code=await meeting_codes.next_code()
+        )
+        db.add(new_meeting)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Code schon vergeben (z.B. ein älterer, zufällig erzeugter) -> nächster Code
+            await db.rollback()
+            continue
+        await db.refresh(new_meeting)
+        meeting_cache.put(MeetingInfo.from_model(new_meeting))  # die ersten Joins kommen gleich
+        return new_meeting
 
-    db.add(new_meeting)
-    db.commit()
-    db.refresh(new_meeting)
-    return new_meeting
+    raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Could not allocate a meeting code")
 
 @router.post("/join", response_model=schemas.ReturnMeetingSchema, status_code=status.HTTP_200_OK)
 async def join_meeting(
     meeting_data:schemas.JoinMeetingSchema,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     current_user: models.User = Depends(get_current_user)
     ):
     if not current_user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
     
-    meeting = db.query(models.Meeting).filter(models.Meeting.meeting_code == meeting_data.meeting_code).first()
+    meeting = await meeting_cache.get(meeting_data.meeting_code)
     if not meeting:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Meeting not found")
     
     # GEÄNDERT: Eingabe-Passwort hashen und mit gehashtem DB-Passwort vergleichen
     hashed_input_password = hash_password(meeting_data.password)
-    if meeting.password != hashed_input_password:
+    if not hmac.compare_digest(meeting.password, hashed_input_password):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Wrong password")
     
-    # Prüfe ob User bereits aktiv im Meeting ist
-    active_participant = db.query(models.MeetingParticipant).filter(
-        models.MeetingParticipant.meeting_id == meeting.id,
-        models.MeetingParticipant.user_id == current_user.id,
-        models.MeetingParticipant.left_at.is_(None)  # Noch nicht verlassen
-    ).first()
-    
-    if active_participant:
+    # Neue Teilnahme anlegen (auch wenn User schon mal da war); None = bereits aktiv im Meeting
+    join_participant = await presence.join(db, meeting.id, current_user.id)
+    if join_participant is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="You are already in this meeting")
-    
-    # Erstelle neuen Join-Eintrag (auch wenn User schon mal da war)
-    join_participant = models.MeetingParticipant(
-        user_id=current_user.id,
-        meeting_id=meeting.id  # Jetzt Integer!
-    )
-
-    db.add(join_participant)
-    db.commit()
-    db.refresh(join_participant)
     return meeting
 
 @router.post("/leave", status_code=status.HTTP_200_OK)
 async def leave_meeting(
     meeting_code: str,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     current_user: models.User = Depends(get_current_user)
     ):
     
     if not current_user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
     
-    meeting = db.query(models.Meeting).filter(models.Meeting.meeting_code == meeting_code).first()
+    meeting = await meeting_cache.get(meeting_code)
     if not meeting:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Meeting not found")
 
-    participant = db.query(models.MeetingParticipant).filter(
-        models.MeetingParticipant.user_id == current_user.id,
-        models.MeetingParticipant.meeting_id == meeting.id,
-        models.MeetingParticipant.left_at.is_(None)  # Nur aktive Teilnahme
-    ).first()
-    
+    # Setzt left_at (der Eintrag wird NICHT gelöscht)
+    participant = await presence.leave(db, meeting.id, current_user.id)
     if not participant:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="You are not in this meeting")
-    
-    # UPDATE: Setze left_at Timestamp (aber lösche den Eintrag NICHT!)
-    participant.left_at = func.now()
-    db.commit()
     return {"left_meeting": participant.left_at}
 
 
+# Broker-Kanal für das Meeting-Signaling
+MEETING_CHANNEL = "meeting"
+
 class MeetingConnectionManager:
-    def __init__(self):
-        self.active_connections: dict[str, dict[int, WebSocket]] = {}
+    """
+    Verwaltet die lokal verbundenen Signaling-Sockets pro Meeting. broadcast und
+    send_to_user laufen über den Broker und erreichen so Teilnehmer auf allen Workern.
+    Jeder Socket hat einen eigenen QueuedSender, damit ein langsamer Teilnehmer
+    den Rest des Raums nicht aufhält.
+    """
 
-    async def connect(self, websocket: WebSocket, meeting_code: str, user_id: int):
+    def __init__(self, broker: Broker):
+        self.active_connections: dict[str, dict[int, QueuedSender]] = {}
+        self.broker = broker
+        broker.subscribe(MEETING_CHANNEL, self._on_broker_message)
+
+    async def connect(self, websocket: WebSocket, meeting_code: str, user_id: int, batch: bool = False):
         if meeting_code not in self.active_connections:
             self.active_connections[meeting_code] = {}
-        self.active_connections[meeting_code][user_id] = websocket
+        # Metriken pro Meeting; beim Verlassen des letzten Teilnehmers werden sie entfernt
+        sender = QueuedSender(websocket, metric_prefix=f"meeting.{meeting_code}",
+                              batch_window=BATCH_WINDOW if batch else 0)
+        sender.start()
+        previous = self.active_connections[meeting_code].get(user_id)
+        self.active_connections[meeting_code][user_id] = sender
+        if previous is not None:
+            # Älterer Socket desselben Users (z.B. Reconnect): nur noch der neue erhält Frames
+            await previous.close()
 
-    def disconnect(self, meeting_code: str, user_id: int):
-        if meeting_code in self.active_connections and user_id in self.active_connections[meeting_code]:
-            del self.active_connections[meeting_code][user_id]
+    async def disconnect(self, meeting_code: str, user_id: int, websocket: WebSocket):
+        connections = self.active_connections.get(meeting_code)
+        # Nur den eigenen Sender entfernen; ein neuerer Socket desselben Users bleibt bestehen
+        if connections and user_id in connections and connections[user_id].websocket is websocket:
+            sender = connections.pop(user_id)
+            await sender.close()
             if not self.active_connections[meeting_code]:
                 del self.active_connections[meeting_code]
+                metrics.remove_prefix(f"meeting.{meeting_code}")
 
     async def broadcast(self, message: str, meeting_code: str, sender_id: int):
-        if meeting_code in self.active_connections:
-            for user_id, connection in self.active_connections[meeting_code].items():
-                if user_id != sender_id:
-                    await connection.send_text(message)
+        await self.broker.publish(MEETING_CHANNEL, {
+            "meeting_code": meeting_code,
+            "message": message,
+            "sender_id": sender_id
+        })
                     
     async def send_to_user(self, message: str, meeting_code: str, user_id: int):
-        if meeting_code in self.active_connections and user_id in self.active_connections[meeting_code]:
-            await self.active_connections[meeting_code][user_id].send_text(message)
+        await self.broker.publish(MEETING_CHANNEL, {
+            "meeting_code": meeting_code,
+            "message": message,
+            "user_id": user_id
+        })
+
+    async def _on_broker_message(self, envelope: dict):
+        meeting_code = envelope["meeting_code"]
+        connections = self.active_connections.get(meeting_code)
+        if not connections:
+            return
+        if "user_id" in envelope:
+            # Gezielt an einen Teilnehmer
+            sender = connections.get(envelope["user_id"])
+            if sender:
+                sender.send(envelope["message"])
+        else:
+            # An alle außer dem Absender; send() blockiert nie, die Writer-Tasks senden parallel
+            for user_id, sender in connections.items():
+                if user_id != envelope["sender_id"]:
+                    sender.send(envelope["message"])
+        metrics.set_gauge(
+            f"meeting.{meeting_code}.max_queue_depth",
+            max(sender.depth() for sender in connections.values())
+        )
                 
-meeting_manager = MeetingConnectionManager()
+meeting_manager = MeetingConnectionManager(broker)
 
 @router.websocket("/ws/{meeting_code}")
-async def meeting_websocket(websocket: WebSocket, meeting_code: str, db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user_ws)):
+async def meeting_websocket(
+    websocket: WebSocket,
+    meeting_code: str,
+    batch: bool = Query(False),  # Client versteht Array-Frames (mehrere Nachrichten gebündelt)
+    current_user: models.User = Depends(get_current_user_ws)
+):
+    if not await meeting_cache.get(meeting_code):
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Meeting not found")
     await websocket.accept()  # GEÄNDERT: await hinzugefügt!
     user_id = current_user.id
-    existing_user_ids = []
-    if meeting_code in meeting_manager.active_connections:
-        existing_user_ids = list(meeting_manager.active_connections[meeting_code].keys())
-        
-    await websocket.send_text(json.dumps({
-        "type": "existing_users",
-        "user_ids": existing_user_ids
-    }))
-      
-    await meeting_manager.connect(websocket, meeting_code, user_id)
-
-    # Informiere alle anderen, dass ein neuer User da ist
-    await meeting_manager.broadcast(
-        json.dumps({"type": "user_joined", "user_id": user_id}),
-        meeting_code,
-        sender_id=user_id # Eigene Nachricht nicht empfangen
-    )
+    # Bereits verbundene Teilnehmer auf allen Workern
+    connection_id, existing_user_ids = await presence.connect(meeting_code, user_id)
 
     # --- Hauptschleife für Nachrichten ---
     try:
+        await websocket.send_text(codec.dumps({
+            "type": "existing_users",
+            "user_ids": existing_user_ids
+        }))
+
+        await meeting_manager.connect(websocket, meeting_code, user_id, batch=batch)
+
+        # Informiere alle anderen, dass ein neuer User da ist
+        await meeting_manager.broadcast(
+            codec.dumps({"type": "user_joined", "user_id": user_id}),
+            meeting_code,
+            sender_id=user_id # Eigene Nachricht nicht empfangen
+        )
+
         while True:
             data = await websocket.receive_text()
-            message_data = json.loads(data) 
+            try:
+                message_data = codec.loads(data)
+            except ValueError:
+                continue  # Kaputten Frame ignorieren, die Verbindung bleibt bestehen
+            if not isinstance(message_data, dict):
+                continue
             
             # Füge die ID des Absenders hinzu, damit der Empfänger weiß, von wem die Nachricht kommt
             message_data['sender_id'] = user_id
            
             recipient_id = message_data.get('recipient_id')
 
+            # Genau einmal kodieren; derselbe Frame geht an alle Empfänger
+            frame = codec.dumps(message_data)
+
             if recipient_id:
                 # Wenn es einen bestimmten Empfänger gibt -> gezielt senden
                 await meeting_manager.send_to_user(
-                    json.dumps(message_data),
+                    frame,
                     meeting_code,
                     recipient_id
                 )
             else:
                 # Wenn es keinen Empfänger gibt -> an alle senden
                 await meeting_manager.broadcast(
-                    json.dumps(message_data),
+                    frame,
                     meeting_code,
                     user_id
                 )
             
     except WebSocketDisconnect:
-        # --- Verbindungsabbruch ---
-        meeting_manager.disconnect(meeting_code, user_id)
-        # Informiere alle verbleibenden, dass der User gegangen ist
-        await meeting_manager.broadcast(
-            json.dumps({"type": "user_left", "user_id": user_id}),
-            meeting_code,
-            sender_id=user_id
-        )
+        pass
+    finally:
+        # --- Verbindungsabbruch (auch bei Fehlern): Sender-Task beenden, offline melden ---
+        await meeting_manager.disconnect(meeting_code, user_id, websocket)
+        still_online = await presence.disconnect(meeting_code, user_id, connection_id)
+        # Informiere alle verbleibenden, dass der User gegangen ist (nicht, solange ein
+        # weiterer Socket desselben Users, z.B. nach einem Reconnect, noch verbunden ist)
+        if not still_online:
+            await meeting_manager.broadcast(
+                codec.dumps({"type": "user_left", "user_id": user_id}),
+                meeting_code,
+                sender_id=user_id
+            )
         
-import os # Wichtig für das Löschen der Datei
-
-
-summaries = {}  # Einfaches In-Memory-Postfach für Zusammenfassungen
-
 @router.websocket("/ws/audio/{meeting_code}")
 async def audio_websocket(
     websocket: WebSocket,
     meeting_code: str,
-    db: Session = Depends(database.get_db),
     current_user: models.User = Depends(get_current_user_ws)
 ):
+    if not await meeting_cache.get(meeting_code):
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Meeting not found")
     await websocket.accept()
     print(f"🎤 Audio WebSocket VERBUNDEN für Meeting {meeting_code}, User {current_user.id}")
     
-    temp_audio_path = f"temp_audio_{meeting_code}_{current_user.id}.webm"
+    # Eigene Spur pro Teilnehmer; Streaming-Erkennung läuft parallel, die Datei bleibt als Fallback
+    track = await audio_ingest.open_track(meeting_code, current_user.id, f"{current_user.first_name} {current_user.last_name}")
+    recognizer = create_streaming_recognizer()
+
+    async def forward_transcripts():
+        # Teil-Transkripte direkt an den Client zurückschicken, finale Segmente an der Spur merken
+        for update in recognizer.poll():
+            if update.is_final:
+                track.add_segment(update.text)
+            await websocket.send_text(codec.dumps({
+                "type": "transcript",
+                "text": update.text,
+                "is_final": update.is_final
+            }))
     
     try:
-        with open(temp_audio_path, "ab") as audio_file:
-            while True:
-                audio_data = await websocket.receive_bytes()
-                audio_file.write(audio_data)
-                print(f"📝 Audio-Chunk empfangen: {len(audio_data)} bytes")
+        while True:
+            audio_data = await websocket.receive_bytes()
+            if not audio_ingest.write(track, audio_data):
+                await websocket.send_text(codec.dumps({"type": "error", "reason": "audio_quota_exceeded"}))
+                await websocket.close(code=status.WS_1009_MESSAGE_TOO_BIG, reason="Audio quota exceeded")
+                break
+            recognizer.feed(audio_data)
+            await forward_transcripts()
 
     except WebSocketDisconnect:
         print(f"🔌 Audio WebSocket GETRENNT! Meeting: {meeting_code}")
-        print(f"🚀 Starte KI-Pipeline für {temp_audio_path}...")
-        
-        # Prüfe ob Datei existiert und Größe
-        if os.path.exists(temp_audio_path):
-            file_size = os.path.getsize(temp_audio_path)
-            print(f"📁 Audio-Datei Größe: {file_size} bytes")
-            
-            if file_size > 0:
-                transkript = transcribe_audio_google(temp_audio_path, "ai-meeting-audio-bucket")
-                print(f"📝 Fertiges Transkript: {transkript}")
-                
-                if transkript and transkript != "Keine Sprache erkannt":
-                    zusammenfassung = summarize_with_gemini(transkript)
-                    print(f"📄 Fertige Zusammenfassung: {zusammenfassung}")
-                    
-                    summaries[meeting_code] = zusammenfassung
-                    print(f"💾 Zusammenfassung gespeichert! summaries = {summaries}")
-                else:
-                    print("❌ Kein gültiges Transkript erhalten")
-            else:
-                print("❌ Audio-Datei ist leer!")
-        else:
-            print("❌ Audio-Datei existiert nicht!")
-        
-        # Aufräumen
-        if os.path.exists(temp_audio_path):
-            os.remove(temp_audio_path)
-            print(f"🗑️ Audio-Datei gelöscht: {temp_audio_path}")
 
     finally:
-        if os.path.exists(temp_audio_path):
-            os.remove(temp_audio_path)
-            print(f"🗑️ (Finally) Audio-Datei gelöscht: {temp_audio_path}")
+        await recognizer.finish()
+        for update in recognizer.poll():
+            if update.is_final:
+                track.add_segment(update.text)
+        track.stream_failed = recognizer.failed
+
+        # Erst die letzte Spur des Meetings startet die Pipeline – ein Job pro Meeting
+        tracks = await audio_ingest.close_track(track)
+        if tracks:
+            job = await submit_meeting_audio(meeting_code, tracks)
+            print(f"🚀 KI-Pipeline für Meeting {meeting_code} als Job {job.id} gestartet ({len(tracks)} Spuren)")
+        elif tracks is not None:
+            print(f"❌ Keine Audiodaten für Meeting {meeting_code} empfangen!")
+
+def summary_response(meeting_code: str) -> dict:
+    # Fertige Zusammenfassungen kommen aus dem LRU-Cache, sonst ein Lookup über den Unique-Index
+    entry = summary_store.get(meeting_code)
+    if entry and entry["status"] == READY:
+        return {"status": "ready", "summary": entry["summary"]}
+
+    # Noch nicht fertig: echten Fortschritt des Jobs melden (nur auf dem Worker mit dem Job bekannt)
+    job = summary_queue.status(meeting_code)
+    if job is None:
+        if entry and entry["status"] == FAILED:
+            return {"status": "failed"}
+        return {"status": "processing"}
+    if job.status == FAILED:
+        return {"status": "failed", "error": job.error, "attempts": job.attempts}
+    return {"status": "processing", "job_status": job.status, "stage": job.stage, "attempts": job.attempts}
 
 @router.get("/{meeting_code}/summary")
-def get_summary(meeting_code: str):
-    print(f"🔍 Summary angefragt für Meeting: {meeting_code}")
-    print(f"📋 Aktuelle summaries: {summaries}")
-    
-    summary = summaries.get(meeting_code)
-    if summary:
-        print(f"✅ Zusammenfassung gefunden!")
-        return {"status": "ready", "summary": summary}
-    else:
-        print(f"⏳ Zusammenfassung noch nicht bereit")
-        return {"status": "processing"}
\ No newline at end of file
+async def get_summary(meeting_code: str, wait: int = Query(0, ge=0, le=SUMMARY_MAX_WAIT)):
+    """
+    Status der Zusammenfassung. Mit `wait` > 0 als Long-Poll: Die Antwort kommt, sobald
+    die Zusammenfassung fertig ist, spätestens aber nach `wait` Sekunden.
+    """
+    if wait == 0:
+        return await asyncio.to_thread(summary_response, meeting_code)
+
+    future = summary_notifier.listen(meeting_code)
+    try:
+        response = await asyncio.to_thread(summary_response, meeting_code)
+        if response["status"] != "processing":
+            return response
+        try:
+            await asyncio.wait_for(future, timeout=wait)
+        except asyncio.TimeoutError:
+            return response
+    finally:
+        summary_notifier.unlisten(meeting_code, future)
+    return await asyncio.to_thread(summary_response, meeting_code)
+
+@router.get("/{meeting_code}/summary/events")
+async def summary_events(meeting_code: str):
+    """
+    Server-Sent Events: Ein offener Stream pro Client statt wiederholtem Polling.
+    Sendet "status"-Events bei Änderungen und zum Schluss ein "summary"-Event.
+    """
+    async def event_stream():
+        while True:
+            future = summary_notifier.listen(meeting_code)
+            try:
+                response = await asyncio.to_thread(summary_response, meeting_code)
+                if response["status"] != "processing":
+                    yield f"event: summary\ndata: {codec.dumps(response)}\n\n"
+                    return
+                yield f"event: status\ndata: {codec.dumps(response)}\n\n"
+                try:
+                    await asyncio.wait_for(asyncio.shield(future), timeout=SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+            finally:
+                summary_notifier.unlisten(meeting_code, future)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,36 @@
+import hmac
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+
+from .. import database
+from ..functions import metrics
+
+# Zugriff nur intern: von diesen Adressen (Monitoring auf demselben Host) oder mit Token
+METRICS_ALLOWED_IPS = {ip.strip() for ip in os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",") if ip.strip()}
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+
+def require_metrics_access(request: Request, x_metrics_token: str | None = Header(None)):
+    if METRICS_TOKEN and x_metrics_token and hmac.compare_digest(x_metrics_token, METRICS_TOKEN):
+        return
+    if request.client and request.client.host in METRICS_ALLOWED_IPS:
+        return
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+    dependencies=[Depends(require_metrics_access)]
+)
+
+@router.get("/")
+def get_metrics():
+    """Gibt die In-Process-Metriken dieses Workers zurück (inkl. Status des Connection-Pools)."""
+    data = metrics.snapshot()
+    data["db_pool"] = {
+        "sync": database.engine.pool.status(),
+        "async": database.async_engine.pool.status(),
+    }
+    return data
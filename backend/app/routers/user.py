@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
 
 # Korrekte, saubere Imports
@@ -48,6 +49,7 @@ def add_contact(
     
     new_friendship = models.Friend(user_id=user_id, friend_id=friend_id)
     db.add(new_friendship)
+    db.add(models.ConversationState(user_id=user_id, contact_id=friend_id, unread_count=0))
     db.commit()
     db.refresh(new_friendship)
     return new_friendship
@@ -59,35 +61,28 @@ def get_contacts(
     current_user: models.User = Depends(get_current_user)
 ):
     """Gibt die vollständigen Profile aller Kontakte des eingeloggten Benutzers zurück."""
-    friendships = db.query(models.Friend).filter(models.Friend.user_id == current_user.id).all()
-    
-    if not friendships:
-        return [] 
-    
-    # Die Liste, die wir am Ende zurückgeben
-    contacts_with_unread = []
-        
-    # 2. Gehe durch jede Freundschaft und berechne die ungelesenen Nachrichten
-    for friendship in friendships:
-        friend_user = db.query(models.User).filter(models.User.id == friendship.friend_id).first()
-        if not friend_user:
-            continue
-
-        # 3. Zähle die Nachrichten vom Freund, die neuer sind als der "Zuletzt Gelesen"-Zeitstempel
-        unread_count = db.query(models.ChatMessage).filter(
-            models.ChatMessage.sender_id == friend_user.id,
-            models.ChatMessage.receiver_id == current_user.id,
-            models.ChatMessage.timestamp > friendship.timestamp
-        ).count()
+    # Eine einzige Abfrage über O(Kontakte) Zeilen: Freunde ⨝ Benutzer ⨝ materialisierte Zähler.
+    # Die Zähler pflegt der Chat-WebSocket beim Schreiben, chat_messages wird hier nicht gelesen.
+    unread_count = func.coalesce(models.ConversationState.unread_count, 0).label("unread_count")
+    rows = db.query(models.User, unread_count).join(
+        models.Friend, models.Friend.friend_id == models.User.id
+    ).outerjoin(
+        models.ConversationState,
+        and_(
+            models.ConversationState.user_id == models.Friend.user_id,
+            models.ConversationState.contact_id == models.Friend.friend_id
+        )
+    ).filter(
+        models.Friend.user_id == current_user.id
+    ).order_by(models.User.id).all()
 
-        # 4. Kombiniere die Benutzerdaten mit der Anzahl
-        contact_data = {
+    return [
+        {
             "id": friend_user.id,
             "email": friend_user.email,
             "first_name": friend_user.first_name,
             "last_name": friend_user.last_name,
-            "unread_count": unread_count
+            "unread_count": count
         }
-        contacts_with_unread.append(contact_data)
-        
-    return contacts_with_unread
\ No newline at end of file
+        for friend_user, count in rows
+    ]
@@ -9,6 +9,8 @@ class Settings(BaseSettings):
     MAIL_SERVER: str
     MAIL_STARTTLS: bool
     MAIL_SSL_TLS: bool
+    MAIL_USE_CREDENTIALS: bool = True
+    MAIL_VALIDATE_CERTS: bool = True
 
     # --- FIX 2: Korrekte Pydantic V2 Syntax verwenden ---
     # Da wir load_dotenv() in main.py verwenden, ist 'env_file' hier optional, 
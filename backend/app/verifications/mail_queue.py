@@ -0,0 +1,224 @@
+# In backend/app/verifications/mail_queue.py
+#
+# Ausgehende Mails laufen über eine Warteschlange statt direkt im Request: Ein einziger
+# Hintergrund-Task sammelt Mails zu kleinen Batches und verschickt sie über eine
+# dauerhaft offene SMTP-Verbindung (statt Verbindungsaufbau + TLS + Login pro Mail).
+# Nach MAIL_IDLE_TIMEOUT Sekunden ohne Mail wird die Verbindung geschlossen.
+
+import asyncio
+import os
+from dataclasses import dataclass
+from email.message import EmailMessage
+
+import aiosmtplib
+
+from ..functions import metrics
+from .config import settings
+
+BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", "20"))
+FLUSH_INTERVAL = int(os.getenv("MAIL_FLUSH_MS", "200")) / 1000
+MAX_QUEUE = int(os.getenv("MAIL_MAX_QUEUE", "5000"))
+IDLE_TIMEOUT = float(os.getenv("MAIL_IDLE_TIMEOUT", "60"))
+MAX_RETRIES = 5
+
+_STOP = object()
+
+
+@dataclass
+class OutgoingMail:
+    recipient: str
+    subject: str
+    html: str
+
+    def to_message(self) -> EmailMessage:
+        message = EmailMessage()
+        message["From"] = settings.MAIL_FROM
+        message["To"] = self.recipient
+        message["Subject"] = self.subject
+        message.set_content(self.html, subtype="html")
+        return message
+
+
+class SMTPConnection:
+    """Eine wiederverwendete SMTP-Verbindung; wird bei Bedarf (neu) aufgebaut."""
+
+    def __init__(self):
+        self._smtp: aiosmtplib.SMTP | None = None
+
+    @property
+    def connected(self) -> bool:
+        return self._smtp is not None and self._smtp.is_connected
+
+    async def send(self, mail: OutgoingMail):
+        if not self.connected:
+            await self._connect()
+        await self._smtp.send_message(mail.to_message())
+
+    async def _connect(self):
+        smtp = aiosmtplib.SMTP(
+            hostname=settings.MAIL_SERVER,
+            port=settings.MAIL_PORT,
+            use_tls=settings.MAIL_SSL_TLS,
+            start_tls=settings.MAIL_STARTTLS,
+            validate_certs=settings.MAIL_VALIDATE_CERTS,
+        )
+        await smtp.connect()
+        if settings.MAIL_USE_CREDENTIALS:
+            await smtp.login(settings.MAIL_USERNAME, settings.MAIL_PASSWORD)
+        self._smtp = smtp
+        metrics.increment("mail.connections")
+
+    async def close(self):
+        if self._smtp is None:
+            return
+        smtp, self._smtp = self._smtp, None
+        try:
+            if smtp.is_connected:
+                await smtp.quit()
+        except Exception:
+            smtp.close()
+
+
+class MailQueue:
+    def __init__(self, connection_factory=SMTPConnection, batch_size: int = BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL, max_queue: int = MAX_QUEUE,
+                 idle_timeout: float = IDLE_TIMEOUT):
+        self.connection = connection_factory()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.idle_timeout = idle_timeout
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._task: asyncio.Task | None = None
+        self._idle_task: asyncio.Task | None = None
+        # Versand und Idle-Schließen dürfen nicht gleichzeitig auf der Verbindung arbeiten
+        self._send_lock = asyncio.Lock()
+        self._last_activity = 0.0
+
+    async def start(self):
+        if self._task is None:
+            self._last_activity = asyncio.get_running_loop().time()
+            self._task = asyncio.create_task(self._run())
+            self._idle_task = asyncio.create_task(self._close_idle())
+
+    async def stop(self):
+        """Beendet die Queue und verschickt vorher alle noch wartenden Mails."""
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+        self._idle_task.cancel()
+        try:
+            await self._idle_task
+        except asyncio.CancelledError:
+            pass
+        self._idle_task = None
+        await self.connection.close()
+
+    def submit(self, recipient: str, subject: str, html: str) -> bool:
+        """
+        Reiht eine Mail ein, ohne zu warten. Gibt False zurück, wenn die Warteschlange
+        voll ist; der Aufrufer entscheidet dann selbst (z.B. später erneut senden lassen).
+        """
+        try:
+            self._queue.put_nowait(OutgoingMail(recipient, subject, html))
+        except asyncio.QueueFull:
+            metrics.increment("mail.rejected")
+            return False
+        metrics.set_gauge("mail.queue_depth", self._queue.qsize())
+        return True
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            # Kein wait_for(queue.get()): das kann (vor Python 3.12) bei gleichzeitigem Timeout
+            # eine bereits entnommene Mail verlieren. Fenster abwarten, dann nur synchron entnehmen.
+            stopping = self._drain(batch)
+            if not stopping and len(batch) < self.batch_size:
+                await asyncio.sleep(self.flush_interval)
+                stopping = self._drain(batch)
+            await self._flush(batch)
+
+        rest = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                rest.append(item)
+        for i in range(0, len(rest), self.batch_size):
+            await self._flush(rest[i:i + self.batch_size])
+
+    def _drain(self, batch: list) -> bool:
+        """Entnimmt ohne Warten bis zur Batch-Größe; True, wenn dabei das Stop-Signal kam."""
+        while len(batch) < self.batch_size and not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is _STOP:
+                return True
+            batch.append(item)
+        return False
+
+    async def _close_idle(self):
+        # Eigener Timer statt Timeout auf queue.get(): schließt die Verbindung, sobald
+        # MAIL_IDLE_TIMEOUT seit dem letzten Versand vergangen ist
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(max(self._last_activity + self.idle_timeout - loop.time(), 0.1))
+            async with self._send_lock:
+                if loop.time() - self._last_activity >= self.idle_timeout:
+                    await self.connection.close()
+                    self._last_activity = loop.time()
+
+    async def _flush(self, batch: list[OutgoingMail]):
+        async with self._send_lock:
+            await self._flush_locked(batch)
+            self._last_activity = asyncio.get_running_loop().time()
+
+    async def _flush_locked(self, batch: list[OutgoingMail]):
+        pending = list(batch)
+        delay = 0.5
+        for attempt in range(1, MAX_RETRIES + 1):
+            try:
+                with metrics.timed("mail.send_batch"):
+                    while pending:
+                        await self._send_one(pending[0])
+                        pending.pop(0)
+                metrics.set_gauge("mail.queue_depth", self._queue.qsize())
+                return
+            except Exception as e:
+                # Nur Verbindungsfehler und temporäre (4xx) Antworten landen hier
+                print(f"Fehler beim Mailversand ({len(pending)} offen, Versuch {attempt}/{MAX_RETRIES}): {e}")
+                await self.connection.close()
+                await asyncio.sleep(delay)
+                delay *= 2
+        metrics.increment("mail.lost", len(pending))
+        print(f"❌ Mails konnten nicht versendet werden: {[mail.recipient for mail in pending]}")
+
+    async def _send_one(self, mail: OutgoingMail):
+        """
+        Verschickt eine Mail. Dauerhafte Fehler dieser einen Mail (abgelehnte Adresse,
+        5xx auf Daten, nicht baubare Nachricht) werden gezählt und übersprungen, damit
+        sie den Rest des Batches nicht mitreißen. Alles andere wirft weiter.
+        """
+        try:
+            await self.connection.send(mail)
+            metrics.increment("mail.sent")
+        except (aiosmtplib.SMTPAuthenticationError, aiosmtplib.SMTPConnectResponseError):
+            raise  # betrifft die Verbindung, nicht diese Mail
+        except aiosmtplib.SMTPRecipientsRefused as e:
+            self._skip(mail, e)
+        except aiosmtplib.SMTPResponseException as e:
+            if e.code < 500:
+                raise
+            self._skip(mail, e)
+        except (ValueError, UnicodeError) as e:
+            self._skip(mail, e)
+
+    @staticmethod
+    def _skip(mail: OutgoingMail, error: Exception):
+        metrics.increment("mail.refused")
+        print(f"❌ Mail an {mail.recipient} abgelehnt: {error}")
+
+mail_queue = MailQueue()
@@ -0,0 +1,72 @@
+# In backend/app/verifications/smtp_sink.py
+#
+# Minimaler lokaler SMTP-Server für Tests: nimmt Mails an (ohne TLS, ohne Login) und
+# legt sie in `messages` ab. Unterstützt genau das, was der MailQueue-Client braucht,
+# inklusive mehrerer Mails über eine Verbindung.
+#
+#   sink = SMTPSink()
+#   await sink.start()        # MAIL_SERVER=127.0.0.1, MAIL_PORT=sink.port
+#   ...
+#   await sink.stop()
+
+import asyncio
+from email import message_from_bytes
+from email.message import Message
+
+
+class SMTPSink:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.messages: list[Message] = []
+        self.connections = 0
+        self._server: asyncio.base_events.Server | None = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+
+        async def reply(line: str):
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        await reply("220 smtp-sink ready")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode(errors="replace").strip()
+                verb = command.split(" ", 1)[0].upper()
+                if verb == "EHLO":
+                    await reply("250-smtp-sink")
+                    await reply("250 8BITMIME")
+                elif verb in ("HELO", "MAIL", "RCPT", "RSET", "NOOP"):
+                    await reply("250 OK")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    data = bytearray()
+                    while True:
+                        chunk = await reader.readline()
+                        if chunk in (b".\r\n", b".\n", b""):
+                            break
+                        if chunk.startswith(b".."):
+                            chunk = chunk[1:]
+                        data.extend(chunk)
+                    self.messages.append(message_from_bytes(bytes(data)))
+                    await reply("250 OK: queued")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        finally:
+            writer.close()
@@ -0,0 +1,82 @@
+"""
+Lastvergleich für Chat-Nachrichten: Commit pro Nachricht (bisheriger /chat/ws-Pfad)
+gegen den Write-Behind-Writer mit Micro-Batches. Ausgabe in Nachrichten pro Sekunde.
+
+Aufruf aus dem backend/-Ordner:
+    python -m benchmarks.bench_chat_writes [anzahl_nachrichten]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import models
+from app.database import Base
+from app.functions.chat_writer import ChatMessageWriter
+
+SENDER_ID, RECEIVER_ID = 1, 2
+
+
+async def setup(path: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with session_factory() as db:
+        db.add_all([
+            models.User(id=SENDER_ID, email="a@example.com", password_hash="x", first_name="A", last_name="A"),
+            models.User(id=RECEIVER_ID, email="b@example.com", password_hash="x", first_name="B", last_name="B"),
+            models.ConversationState(user_id=RECEIVER_ID, contact_id=SENDER_ID, unread_count=0),
+        ])
+        await db.commit()
+    return engine, session_factory
+
+
+async def per_message_commit(session_factory, count: int) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        async with session_factory() as db:
+            message = models.ChatMessage(sender_id=SENDER_ID, receiver_id=RECEIVER_ID, message=f"msg {i}", timestamp=func.now())
+            db.add(message)
+            await db.execute(
+                update(models.ConversationState).where(
+                    models.ConversationState.user_id == RECEIVER_ID,
+                    models.ConversationState.contact_id == SENDER_ID
+                ).values(unread_count=models.ConversationState.unread_count + 1)
+            )
+            await db.commit()
+            await db.refresh(message)
+    return time.perf_counter() - start
+
+
+async def write_behind(session_factory, count: int) -> float:
+    writer = ChatMessageWriter(session_factory=session_factory)
+    await writer.start()
+    start = time.perf_counter()
+    for i in range(count):
+        await writer.submit(SENDER_ID, RECEIVER_ID, f"msg {i}")
+    await writer.stop()  # inkl. Flush, damit alles wirklich gespeichert ist
+    return time.perf_counter() - start
+
+
+async def main(count: int):
+    for name, scenario in (("Commit pro Nachricht", per_message_commit), ("Write-Behind", write_behind)):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine, session_factory = await setup(os.path.join(tmp, "bench.db"))
+            elapsed = await scenario(session_factory, count)
+            async with session_factory() as db:
+                stored = await db.scalar(select(func.count(models.ChatMessage.id)))
+            await engine.dispose()
+        assert stored == count, f"{name}: {stored} von {count} gespeichert"
+        print(f"{name:<22} {count / elapsed:>10.0f} Nachrichten/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
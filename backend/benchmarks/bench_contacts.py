@@ -0,0 +1,88 @@
+"""
+Benchmark für /user/get_contacts: Anzahl der SQL-Abfragen und Laufzeit
+bei wachsender Kontaktanzahl.
+
+Aufruf aus dem backend/-Ordner:
+    python -m benchmarks.bench_contacts
+"""
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base
+from app.functions.chat_writer import ChatMessageWriter
+from app.routers.user import get_contacts
+
+MESSAGES_PER_CONTACT = 20
+
+
+async def write_messages(path: str, sender_ids: list[int], receiver_id: int):
+    """Schreibt die Nachrichten über den echten ChatMessageWriter (inkl. Ungelesen-Zähler)."""
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    writer = ChatMessageWriter(session_factory=async_sessionmaker(bind=async_engine, expire_on_commit=False))
+    await writer.start()
+    for sender_id in sender_ids:
+        for _ in range(MESSAGES_PER_CONTACT):
+            await writer.submit(sender_id, receiver_id, "hi")
+    await writer.stop()
+    await async_engine.dispose()
+
+
+def run(contact_count: int, path: str) -> tuple[int, float]:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+
+    me = models.User(email="me@example.com", password_hash="x", first_name="Me", last_name="Bench")
+    db.add(me)
+    db.flush()
+
+    read_at = datetime.utcnow() - timedelta(hours=1)
+    friend_ids = []
+    for i in range(contact_count):
+        friend = models.User(email=f"friend{i}@example.com", password_hash="x", first_name="F", last_name=str(i))
+        db.add(friend)
+        db.flush()
+        db.add(models.Friend(user_id=me.id, friend_id=friend.id, timestamp=read_at))
+        db.add(models.ConversationState(user_id=me.id, contact_id=friend.id, unread_count=0))
+        friend_ids.append(friend.id)
+    db.commit()
+
+    # Die Zähler entstehen über denselben Pfad wie im Betrieb, nicht durch direktes Setzen
+    asyncio.run(write_messages(path, friend_ids, me.id))
+
+    queries = 0
+
+    def count_query(*_):
+        nonlocal queries
+        queries += 1
+
+    event.listen(engine, "before_cursor_execute", count_query)
+    start = time.perf_counter()
+    contacts = get_contacts(db=db, current_user=me)
+    elapsed = time.perf_counter() - start
+    event.remove(engine, "before_cursor_execute", count_query)
+
+    assert len(contacts) == contact_count
+    assert all(c["unread_count"] == MESSAGES_PER_CONTACT for c in contacts)
+    db.close()
+    engine.dispose()
+    return queries, elapsed
+
+
+if __name__ == "__main__":
+    print(f"{'Kontakte':>10} {'Abfragen':>10} {'Zeit (ms)':>10}")
+    for n in (1, 10, 100, 500):
+        with tempfile.TemporaryDirectory() as tmp:
+            queries, elapsed = run(n, os.path.join(tmp, "bench.db"))
+            print(f"{n:>10} {queries:>10} {elapsed * 1000:>10.2f}")
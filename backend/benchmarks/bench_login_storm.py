@@ -0,0 +1,63 @@
+"""
+Lasttest "Login-Sturm": Wie stark verzögert bcrypt den Event-Loop und damit jede
+WebSocket-Nachricht auf demselben Worker?
+
+Ein Ticker-Task misst, wie spät er alle 10 ms aufwacht (Event-Loop-Lag = zusätzliche
+Latenz für jeden Socket), während gleichzeitig viele Passwort-Prüfungen laufen:
+  - inline:  pwd_context.verify direkt im Event-Loop (bisheriges Verhalten)
+  - pool:    app.functions.password.verify_password (Thread-Pool)
+
+Aufruf aus dem backend/-Ordner:
+    python -m benchmarks.bench_login_storm [anzahl_logins]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+from app.functions import password
+
+TICK = 0.01
+
+
+async def ticker(lags: list[float], stop: asyncio.Event):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def storm(mode: str, logins: int, password_hash: str) -> list[float]:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    tick_task = asyncio.create_task(ticker(lags, stop))
+
+    async def inline_login():
+        password.pwd_context.verify("geheim", password_hash)
+
+    async def pool_login():
+        await password.verify_password("geheim", password_hash)
+
+    login = inline_login if mode == "inline" else pool_login
+    await asyncio.sleep(0.05)
+    await asyncio.gather(*(login() for _ in range(logins)))
+    stop.set()
+    await tick_task
+    return lags
+
+
+def report(name: str, lags: list[float]):
+    lags_ms = sorted(lag * 1000 for lag in lags)
+    p99 = lags_ms[int(len(lags_ms) * 0.99) - 1] if len(lags_ms) > 1 else lags_ms[0]
+    print(f"{name:<8} p50 {statistics.median(lags_ms):>8.2f} ms   p99 {p99:>8.2f} ms   max {lags_ms[-1]:>8.2f} ms")
+
+
+async def main(logins: int):
+    password_hash = password.pwd_context.hash("geheim")
+    print(f"{logins} gleichzeitige Logins, Event-Loop-Lag des Tickers:")
+    for mode in ("inline", "pool"):
+        report(mode, await storm(mode, logins, password_hash))
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50))
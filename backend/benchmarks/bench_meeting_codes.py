@@ -0,0 +1,115 @@
+"""
+Meeting-Codes bei vielen bestehenden Meetings: bisherige Schleife "zufälliger Code +
+SELECT, bis frei" gegen den MeetingCodeAllocator (Permutation einer fortlaufenden
+Nummer, Unique-Constraint fängt Kollisionen mit Alt-Codes ab).
+
+Gemessen werden Abfragen und Zeit pro neu angelegtem Meeting (inkl. INSERT) sowie die
+Kollisionen. Die bestehenden Meetings haben zufällige Codes wie bisher.
+
+Aufruf aus dem backend/-Ordner:
+    python -m benchmarks.bench_meeting_codes [bestehende_meetings] [neue_meetings]
+"""
+import asyncio
+import os
+import random
+import string
+import sys
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base
+from app.functions.meeting_codes import MeetingCodeAllocator
+
+ALPHABET = string.ascii_uppercase + string.digits
+INSERT_CHUNK = 50_000
+
+loop = asyncio.new_event_loop()  # der Allocator ist async, der Benchmark synchron
+
+
+def random_code() -> str:
+    return "".join(random.choices(ALPHABET, k=6))
+
+
+def populate(engine, existing: int):
+    host = {"email": "host@example.com", "password_hash": "x", "first_name": "H", "last_name": "B"}
+    with engine.begin() as conn:
+        conn.execute(insert(models.User), [host])
+        codes = set()
+        while len(codes) < existing:
+            codes.add(random_code())
+        codes = list(codes)
+        for i in range(0, existing, INSERT_CHUNK):
+            conn.execute(insert(models.Meeting), [
+                {"meeting_code": code, "meeting_name": "bench", "host_id": 1, "password": "x"}
+                for code in codes[i:i + INSERT_CHUNK]
+            ])
+
+
+def legacy_code(db) -> str:
+    while True:
+        code = random_code()
+        if db.scalar(select(models.Meeting.id).where(models.Meeting.meeting_code == code)) is None:
+            return code
+
+
+def create_legacy(db) -> int:
+    db.add(models.Meeting(meeting_code=legacy_code(db), meeting_name="neu", host_id=1, password="x"))
+    db.commit()
+    return 0
+
+
+def create_allocated(db, allocator: MeetingCodeAllocator) -> int:
+    collisions = 0
+    while True:
+        code = loop.run_until_complete(allocator.next_code())
+        db.add(models.Meeting(meeting_code=code, meeting_name="neu", host_id=1, password="x"))
+        try:
+            db.commit()
+            return collisions
+        except IntegrityError:
+            db.rollback()
+            collisions += 1
+
+
+def measure(engine, label: str, create, count: int):
+    db = sessionmaker(bind=engine)()
+    queries = 0
+
+    def count_query(*_):
+        nonlocal queries
+        queries += 1
+
+    event.listen(engine, "before_cursor_execute", count_query)
+    start = time.perf_counter()
+    collisions = sum(create(db) for _ in range(count))
+    elapsed = time.perf_counter() - start
+    event.remove(engine, "before_cursor_execute", count_query)
+    db.close()
+    print(f"{label:>10}: {elapsed / count * 1e6:8.1f} µs/Meeting  {queries / count:5.2f} Abfragen/Meeting  "
+          f"{collisions} Kollisionen")
+
+
+def main():
+    existing = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    start = time.perf_counter()
+    populate(engine, existing)
+    print(f"{existing} bestehende Meetings angelegt ({time.perf_counter() - start:.1f} s)")
+
+    allocator = MeetingCodeAllocator(dialect="sqlite", secret="benchmark")
+    measure(engine, "bisher", create_legacy, count)
+    measure(engine, "allocator", lambda db: create_allocated(db, allocator), count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Micro-Benchmark für das Meeting-Signaling: CPU-Zeit pro eingehendem Frame
+(dekodieren, sender_id setzen, kodieren, an alle Teilnehmer ausliefern) für
+Räume mit 2 bis 50 Teilnehmern.
+
+"vorher": Standardbibliothek json wie im ursprünglichen meeting_websocket
+          (ein json.dumps pro Frame, an alle Empfänger gesendet).
+"nachher": app.functions.codec (orjson, falls installiert), ebenfalls ein Frame für alle Empfänger.
+Der Unterschied ist damit allein der Codec.
+
+Aufruf aus dem backend/-Ordner:
+    python -m benchmarks.bench_signaling_frames
+"""
+import json
+import time
+
+from app.functions import codec
+
+FRAMES = 2000
+ICE_FRAME = json.dumps({
+    "type": "ice_candidate",
+    "candidate": {
+        "candidate": "candidate:842163049 1 udp 1677729535 203.0.113.7 54321 typ srflx raddr 192.168.1.23 rport 54321 generation 0 ufrag a1b2 network-cost 999",
+        "sdpMid": "0",
+        "sdpMLineIndex": 0,
+        "usernameFragment": "a1b2",
+    },
+})
+
+
+class FakeSocket:
+    """Simuliert den Transport: send_text kodiert den Text wie uvicorn nach UTF-8."""
+
+    def __init__(self):
+        self.sent_bytes = 0
+
+    def send_text(self, text: str):
+        self.sent_bytes += len(text.encode("utf-8"))
+
+
+def handle_before(raw: str, sockets: list[FakeSocket]):
+    message_data = json.loads(raw)
+    message_data["sender_id"] = 1
+    frame = json.dumps(message_data)
+    for socket in sockets:
+        socket.send_text(frame)
+
+
+def handle_after(raw: str, sockets: list[FakeSocket]):
+    message_data = codec.loads(raw)
+    message_data["sender_id"] = 1
+    frame = codec.dumps(message_data)
+    for socket in sockets:
+        socket.send_text(frame)
+
+
+def cpu_per_frame(handler, participants: int) -> float:
+    sockets = [FakeSocket() for _ in range(participants - 1)]
+    start = time.process_time()
+    for _ in range(FRAMES):
+        handler(ICE_FRAME, sockets)
+    return (time.process_time() - start) / FRAMES
+
+
+if __name__ == "__main__":
+    print(f"Codec: {'orjson' if codec.orjson else 'json (Standardbibliothek)'}")
+    print(f"{'Teilnehmer':>10} {'vorher (µs)':>12} {'nachher (µs)':>13} {'Faktor':>8}")
+    for participants in (2, 5, 10, 25, 50):
+        before = cpu_per_frame(handle_before, participants)
+        after = cpu_per_frame(handle_after, participants)
+        print(f"{participants:>10} {before * 1e6:>12.1f} {after * 1e6:>13.1f} {before / after:>7.1f}x")
@@ -0,0 +1,79 @@
+"""
+Kaltstart eines Workers: Wie lange dauert `import app.main`, und welche Module kosten
+dabei die meiste Zeit? Misst per `python -X importtime` in frischen Prozessen.
+
+  - lazy:  import app.main (aktuelles Verhalten, Cloud-Clients über clients.py)
+  - eager: wie vorher – Google-SDKs importieren und SpeechClient() beim Start bauen,
+           danach import app.main
+
+Ohne Google-Credentials schlägt SpeechClient() im eager-Modus fehl; genau dieser Absturz
+beim Worker-Start ist mit der lazy Registry weg. Der Fehler wird nur ausgegeben.
+
+Aufruf aus dem backend/-Ordner:
+    python -m benchmarks.bench_startup [durchläufe]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+SCENARIOS = {
+    "lazy": "import app.main",
+    "eager": (
+        "from google.cloud import speech, storage\n"
+        "import google.generativeai\n"
+        "try:\n"
+        "    speech.SpeechClient()\n"
+        "except Exception as e:\n"
+        "    print('SpeechClient:', e)\n"
+        "import app.main"
+    ),
+}
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Kumulierte Importzeit in µs pro Top-Level-Import (Einrückung 0)."""
+    result = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name[1:].rstrip()  # verschachtelte Importe sind zusätzlich eingerückt
+        if not name.startswith(" "):
+            result[name] = result.get(name, 0) + int(cumulative)
+    return result
+
+
+def run(code: str) -> tuple[float, dict[str, int]]:
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    return wall, parse_importtime(proc.stderr)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for name, code in SCENARIOS.items():
+        try:
+            results = [run(code) for _ in range(runs)]
+        except RuntimeError as e:
+            print(f"{name:>6}: nicht lauffähig ({e})")
+            continue
+        walls = [wall for wall, _ in results]
+        modules = results[-1][1]
+        google_us = sum(us for module, us in modules.items() if module.startswith("google"))
+        print(f"{name:>6}: Prozessstart median {statistics.median(walls) * 1000:7.1f} ms  "
+              f"(min {min(walls) * 1000:.1f} ms), davon google.*: {google_us / 1000:.1f} ms")
+        for module, us in sorted(modules.items(), key=lambda item: -item[1])[:8]:
+            print(f"        {us / 1000:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,8 @@ function ChatPage() {
     const { contact_id } = useParams<{ contact_id: string }>();
     const [newMessage, setNewMessage] = useState("");
     const [messages, setMessages] = useState<Message[]>([]);
+    const [hasOlder, setHasOlder] = useState(false);
+    const [loadingOlder, setLoadingOlder] = useState(false);
     const wsRef = useRef<WebSocket | null>(null);
     const chatService = new chatServices();
 
@@ -21,8 +23,10 @@ function ChatPage() {
         const fetchMessages = async () => {
             if (!contact_id) return;
             try {
-                const data = await chatService.getMessages(Number(contact_id));
-                setMessages(data as Message[]);
+                const page = await chatService.getMessages(Number(contact_id)) as Message[];
+                setMessages(page);
+                // Volle Seite -> es könnte noch ältere Nachrichten geben
+                setHasOlder(page.length === chatService.PAGE_SIZE);
             } catch (error) {
                 console.error("Error fetching messages:", error);
             }
@@ -30,6 +34,21 @@ function ChatPage() {
         fetchMessages();
     }, [contact_id]);
 
+    // Ältere Nachrichten nachladen (Cursor = älteste geladene Nachricht)
+    const loadOlderMessages = async () => {
+        if (!contact_id || messages.length === 0 || loadingOlder) return;
+        setLoadingOlder(true);
+        try {
+            const page = await chatService.getMessages(Number(contact_id), messages[0].id) as Message[];
+            setMessages(prev => [...page.filter(m => !prev.some(p => p.id === m.id)), ...prev]);
+            setHasOlder(page.length === chatService.PAGE_SIZE);
+        } catch (error) {
+            console.error("Error fetching older messages:", error);
+        } finally {
+            setLoadingOlder(false);
+        }
+    };
+
     // WebSocket-Verbindung
     useEffect(() => {
         const token = localStorage.getItem('access_token');
@@ -45,6 +64,10 @@ function ChatPage() {
  
     socket.onmessage = (event) => {
         const neueNachricht = JSON.parse(event.data);
+        if (neueNachricht.type === "error") {
+            console.error("❌ Nachricht abgelehnt:", neueNachricht.reason);
+            return;
+        }
         setMessages(prev => {
             if (prev.some(m => m.id === neueNachricht.id)) return prev;
             return [...prev, neueNachricht];
@@ -86,6 +109,11 @@ function ChatPage() {
         <div>
             <h1>Chat Page</h1>
             <div>
+                {hasOlder && (
+                    <button type="button" onClick={loadOlderMessages} disabled={loadingOlder}>
+                        {loadingOlder ? "Lädt..." : "Ältere Nachrichten laden"}
+                    </button>
+                )}
                 {messages.map((msg) => (
                     <div key={msg.id}>
                         <strong>{msg.sender_id}:</strong> {msg.message}
@@ -111,15 +111,14 @@ function MeetingPage() {
 
     // Meeting WebSocket
     ws.current = new WebSocket(
-      `ws://localhost:8000/meeting/ws/${meetingCode}?token=${token}`
+      `ws://localhost:8000/meeting/ws/${meetingCode}?token=${token}&batch=1`
     );
 
     ws.current.onopen = () => {
       console.log("✅ Meeting-WebSocket verbunden!");
     };
 
-    ws.current.onmessage = async (event) => {
-      const message: WebSocketMessage = JSON.parse(event.data);
+    const handleMessage = async (message: WebSocketMessage) => {
       console.log("📨 Meeting-Nachricht erhalten:", message);
 
       switch (message.type) {
@@ -188,6 +187,14 @@ function MeetingPage() {
       }
     };
 
+    ws.current.onmessage = async (event) => {
+      // Mit batch=1 bündelt der Server mehrere Nachrichten (z.B. ICE-Kandidaten) in einem Array-Frame
+      const data: WebSocketMessage | WebSocketMessage[] = JSON.parse(event.data);
+      for (const message of Array.isArray(data) ? data : [data]) {
+        await handleMessage(message);
+      }
+    };
+
     // Audio WebSocket für AI
     audioWsRef.current = new WebSocket(
       `ws://localhost:8000/meeting/ws/audio/${meetingCode}?token=${token}`
@@ -18,35 +18,46 @@ function SummaryPage() {
       return;
     }
 
-    console.log("Starte Polling für die Zusammenfassung...");
+    console.log("Warte auf die Zusammenfassung (Long-Poll)...");
+    let cancelled = false;
 
-    // Starte ein Intervall, das alle 5 Sekunden beim Server nachfragt
-    const intervalId = setInterval(async () => {
-      try {
-        const response = await meetingService.meetingSummary(meetingCode);
+    // Long-Poll: Der Server hält jede Anfrage offen, bis die Zusammenfassung fertig ist
+    // (max. 30 Sekunden), danach wird sofort die nächste Anfrage gestellt.
+    const waitForSummary = async () => {
+      while (!cancelled) {
+        try {
+          const response = await meetingService.meetingSummary(meetingCode, 30);
+          if (cancelled) return;
 
-        // Prüfe die Antwort vom Server
-        if (response.status === "ready") {
-          console.log("Zusammenfassung ist fertig!");
-          setSummary(response.summary || "Keine Zusammenfassung erhalten.");
-          setIsLoading(false);
-          clearInterval(intervalId); // WICHTIG: Stoppe das Nachfragen!
-        } else {
+          // Prüfe die Antwort vom Server
+          if (response.status === "ready") {
+            console.log("Zusammenfassung ist fertig!");
+            setSummary(response.summary || "Keine Zusammenfassung erhalten.");
+            setIsLoading(false);
+            return;
+          }
+          if (response.status === "failed") {
+            setError("Die Zusammenfassung konnte nicht erstellt werden.");
+            setIsLoading(false);
+            return;
+          }
           // response.status ist 'processing'
           console.log("Zusammenfassung wird noch generiert...");
+        } catch (err) {
+          if (cancelled) return;
+          console.error("Fehler beim Abrufen der Zusammenfassung:", err);
+          setError("Ein Fehler ist aufgetreten.");
+          setIsLoading(false);
+          return;
         }
-      } catch (err) {
-        console.error("Fehler beim Abrufen der Zusammenfassung:", err);
-        setError("Ein Fehler ist aufgetreten.");
-        setIsLoading(false);
-        clearInterval(intervalId); // Auch bei einem Fehler stoppen
       }
-    }, 5000); // Frage alle 5 Sekunden
+    };
+    waitForSummary();
 
     // WICHTIG: Die Aufräumfunktion. Sie wird ausgeführt, wenn die Seite verlassen wird.
     return () => {
-      console.log("Stoppe Polling.");
-      clearInterval(intervalId);
+      console.log("Stoppe Warten auf die Zusammenfassung.");
+      cancelled = true;
     };
   }, [meetingCode, meetingService]); // Abhängigkeiten korrekt angegeben
 
@@ -2,9 +2,13 @@ export class chatServices {
 
 private API_URL = 'http://localhost:8000/chat';
 
-    async getMessages(contact_id: number): Promise<unknown> {
+readonly PAGE_SIZE = 50;
+
+    // Seitenweise: ohne beforeId die neuesten Nachrichten, sonst die ältere Seite davor
+    async getMessages(contact_id: number, beforeId?: number, limit: number = this.PAGE_SIZE): Promise<unknown> {
+        const cursor = beforeId !== undefined ? `&before_id=${beforeId}` : '';
         try {
-            const response = await fetch(`${this.API_URL}/get_chat?friend_id=${contact_id}`, {
+            const response = await fetch(`${this.API_URL}/get_chat?friend_id=${contact_id}&limit=${limit}${cursor}`, {
                 method: 'GET',
                 headers: {
                     'Content-Type': 'application/json',
@@ -49,11 +49,12 @@ export class meetingServices{
         }
     }
 
-    async meetingSummary(meetingCode: string): Promise<{ status: string; summary?: string }> {
+    // wait > 0: Long-Poll – der Server antwortet, sobald die Zusammenfassung fertig ist (max. wait Sekunden)
+    async meetingSummary(meetingCode: string, wait: number = 0): Promise<{ status: string; summary?: string }> {
     const token = localStorage.getItem("access_token");
     try {
       const response = await fetch(
-        `${this.API_URL}/${meetingCode}/summary`,
+        `${this.API_URL}/${meetingCode}/summary?wait=${wait}`,
         {
           method: "GET",
           headers: {